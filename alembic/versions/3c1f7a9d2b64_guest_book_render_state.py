@@ -0,0 +1,38 @@
+"""guest book render state
+
+Revision ID: 3c1f7a9d2b64
+Revises: 880da683bd4b
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f7a9d2b64"
+down_revision: Union[str, Sequence[str], None] = "880da683bd4b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column("guest_book", "pdf_file", existing_type=mysql.MEDIUMBLOB(), nullable=True)
+    op.add_column("guest_book", sa.Column("render_state", sa.String(length=20), server_default="done", nullable=False))
+    op.add_column("guest_book", sa.Column("render_error", sa.String(length=1000), nullable=True))
+    op.add_column("guest_book", sa.Column("submission", mysql.LONGTEXT(), nullable=True))
+    op.create_index(op.f("ix_guest_book_render_state"), "guest_book", ["render_state"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_guest_book_render_state"), table_name="guest_book")
+    op.drop_column("guest_book", "submission")
+    op.drop_column("guest_book", "render_error")
+    op.drop_column("guest_book", "render_state")
+    op.alter_column("guest_book", "pdf_file", existing_type=mysql.MEDIUMBLOB(), nullable=False)
@@ -0,0 +1,35 @@
+"""guest book listing indexes
+
+Revision ID: 5d8a0c3e7f21
+Revises: b7e2d4f19a03
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8a0c3e7f21"
+down_revision: Union[str, Sequence[str], None] = "b7e2d4f19a03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_guest_book_created_at_id", "guest_book", ["created_at", "id"], unique=False)
+    op.create_index("ix_guest_book_company_created_at", "guest_book", ["company", "created_at"], unique=False)
+    op.create_index("ix_guest_book_last_name", "guest_book", ["last_name"], unique=False)
+    op.create_index("ix_guest_book_first_name", "guest_book", ["first_name"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_guest_book_first_name", table_name="guest_book")
+    op.drop_index("ix_guest_book_last_name", table_name="guest_book")
+    op.drop_index("ix_guest_book_company_created_at", table_name="guest_book")
+    op.drop_index("ix_guest_book_created_at_id", table_name="guest_book")
@@ -0,0 +1,31 @@
+"""guest book render lease
+
+Revision ID: 9e4b6c2a8d15
+Revises: 5d8a0c3e7f21
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b6c2a8d15"
+down_revision: Union[str, Sequence[str], None] = "5d8a0c3e7f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("guest_book", sa.Column("render_owner", sa.String(length=64), nullable=True))
+    op.add_column("guest_book", sa.Column("render_lease_until", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("guest_book", "render_lease_until")
+    op.drop_column("guest_book", "render_owner")
@@ -0,0 +1,38 @@
+"""guest book pdf blob store
+
+Revision ID: b7e2d4f19a03
+Revises: 3c1f7a9d2b64
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d4f19a03"
+down_revision: Union[str, Sequence[str], None] = "3c1f7a9d2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("guest_book", sa.Column("pdf_sha256", sa.String(length=64), nullable=True))
+    op.add_column("guest_book", sa.Column("pdf_size", mysql.BIGINT(unsigned=True), nullable=True))
+    op.add_column("guest_book", sa.Column("pdf_storage", sa.String(length=20), nullable=True))
+    op.create_index(op.f("ix_guest_book_pdf_sha256"), "guest_book", ["pdf_sha256"], unique=False)
+    # Existing PDFs stay in pdf_file until `python pdf_store_backfill.py` moves them to the blob store
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PDFs already moved to the blob store are not copied back
+    op.drop_index(op.f("ix_guest_book_pdf_sha256"), table_name="guest_book")
+    op.drop_column("guest_book", "pdf_storage")
+    op.drop_column("guest_book", "pdf_size")
+    op.drop_column("guest_book", "pdf_sha256")
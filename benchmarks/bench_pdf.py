@@ -0,0 +1,243 @@
+"""
+PDF Pipeline Benchmarks for Röchling Office API
+Measures signature preprocessing, generate_form and the blob store round trip of the download path
+for parameterized form content sizes, signature sizes and locales, and compares the results with a baseline.
+
+Examples:
+    python benchmarks/bench_pdf.py --output benchmarks/results/latest.json
+    python benchmarks/bench_pdf.py --baseline benchmarks/baseline.json --threshold 0.15
+"""
+
+import tracemalloc
+import statistics
+import itertools
+import tempfile
+import platform
+import datetime
+import argparse
+import logging
+import random
+import base64
+import time
+import json
+import sys
+import io
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+from pathlib import Path
+from typing import Callable, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import ImageDraw, Image
+
+from src.v1.guest_book.signature import signature_processor
+from src.v1.guest_book.renderer import build_warm_up_sample
+from src.v1.guest_book.layers import body_layer_cache
+from src.v1.guest_book.form import generate_form
+from src.storage import LocalBlobStore
+from src.config import config
+
+LOCALES = ("cs", "en", "de")
+# Metrics compared with the baseline, lower is better for all of them
+COMPARED_METRICS = ("wall_ms_median", "cpu_ms_median", "python_heap_peak_kb")
+PARAGRAPH = (
+    '<p class="ql-align-left">Návštěvníci jsou povinni dodržovat bezpečnostní pokyny, nosit ochranné pomůcky '
+    "a pohybovat se pouze ve vyznačených prostorách. Visitors must follow the safety instructions at all times.</p>"
+)
+
+
+def build_form_content(size_kb: int) -> str:
+    # Rich text as produced by the form editor, repeated up to the requested size
+    heading = "<h2>Bezpečnostní pokyny</h2>"
+    count = max((size_kb * 1024 - len(heading)) // len(PARAGRAPH.encode("utf-8")), 1)
+    return heading + "".join(PARAGRAPH for _ in range(count))
+
+
+def build_signature(width: int, height: int) -> str:
+    # Transparent canvas export with a few strokes, like the kiosk signature pad produces
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    rng = random.Random(width * height)
+    points = [(rng.randint(width // 10, width * 9 // 10), rng.randint(height // 5, height * 4 // 5)) for _ in range(12)]
+    draw.line(points, fill=(20, 30, 120, 255), width=max(width // 200, 2), joint="curve")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def parse_sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+def parse_dimensions(value: str) -> list[tuple[int, int]]:
+    dimensions = []
+    for item in value.split(","):
+        width, height = item.lower().split("x")
+        dimensions.append((int(width), int(height)))
+    return dimensions
+
+
+def max_rss_kb() -> float | None:
+    # High-water mark of the whole process, including native allocations (pango, cairo, Pillow)
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(max_rss / 1024 if sys.platform == "darwin" else max_rss, 1)
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int) -> tuple[dict, Any]:
+    """Run ``fn`` and collect wall and CPU time; peak memory is taken from one extra traced run
+    so tracemalloc overhead does not skew the timings.
+
+    tracemalloc only sees the Python heap (``python_heap_peak_kb``). Memory allocated by WeasyPrint's native
+    libraries shows up in ``rss_max_kb``, the process high-water mark after the case. It never goes down, so
+    it is not compared with the baseline and only a growth points at the case that raised it."""
+    for _ in range(warmup):
+        fn()
+
+    wall, cpu = [], []
+    result = None
+    for _ in range(repeat):
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        result = fn()
+        cpu.append((time.process_time() - cpu_started) * 1000)
+        wall.append((time.perf_counter() - wall_started) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "wall_ms_median": round(statistics.median(wall), 3),
+        "wall_ms_min": round(min(wall), 3),
+        "wall_ms_max": round(max(wall), 3),
+        "cpu_ms_median": round(statistics.median(cpu), 3),
+        "python_heap_peak_kb": round(peak / 1024, 1),
+        "rss_max_kb": max_rss_kb(),
+    }, result
+
+
+def run(content_sizes: list[int], signature_sizes: list[tuple[int, int]], locales: list[str], repeat: int, warmup: int) -> list[dict]:
+    results = []
+    signatures = {size: build_signature(*size) for size in signature_sizes}
+    contents = {size: build_form_content(size) for size in content_sizes}
+
+    with tempfile.TemporaryDirectory(prefix="bench-blobs-") as blob_root:
+        store = LocalBlobStore(blob_root)
+
+        for (width, height), signature in signatures.items():
+            stats, processed = measure(lambda: signature_processor.process(signature), repeat, warmup)
+            stats.update(case=f"signature[{width}x{height}]", stage="signature", output_bytes=processed.processed_bytes)
+            results.append(stats)
+
+        for content_kb, (width, height), locale in itertools.product(content_sizes, signature_sizes, locales):
+            data = build_warm_up_sample(locale).model_copy(
+                update={"signature": signature_processor.process(signatures[(width, height)]).data_url}
+            )
+            case = f"{locale}-{content_kb}kb-{width}x{height}"
+
+            stats, pdf = measure(lambda: generate_form(data, contents[content_kb]).getvalue(), repeat, warmup)
+            stats.update(case=f"generate_form[{case}]", stage="generate_form", output_bytes=len(pdf))
+            results.append(stats)
+            logger.info(f"generate_form[{case}] {stats['wall_ms_median']} ms, {len(pdf) / 1024:.1f} KB")
+
+            # Download path: the PDF is stored once and then read back from the blob store
+            stored = store.put(pdf)
+            stats, _ = measure(lambda: store.read(stored.sha256), repeat, warmup)
+            stats.update(case=f"download[{case}]", stage="download", output_bytes=stored.size)
+            results.append(stats)
+
+    return results
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    baseline_results = {item["case"]: item for item in baseline.get("results", [])}
+    regressions = []
+    for item in results:
+        previous = baseline_results.get(item["case"])
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), item.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > threshold:
+                regressions.append(f"{item['case']} {metric}: {old} -> {new} (+{change * 100:.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the guest book PDF pipeline")
+    parser.add_argument("--content-sizes", default="1,10,50", help="Form content sizes in KB (default: 1,10,50)")
+    parser.add_argument("--signature-sizes", default="480x240,1600x800", help="Signature canvas sizes (default: 480x240,1600x800)")
+    parser.add_argument("--locales", default=",".join(LOCALES), help="Locales to render (default: cs,en,de)")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured runs per case (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per case (default: 1)")
+    parser.add_argument("--two-layer", action="store_true", help="Render with the cached form text layer")
+    parser.add_argument("--output", default=str(project_root / "benchmarks" / "results" / "latest.json"), help="Results JSON file")
+    parser.add_argument("--baseline", help="Baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown against the baseline (default: 0.15 = 15%%)")
+    args = parser.parse_args()
+
+    config.RENDER_TWO_LAYER = args.two_layer
+    body_layer_cache.clear()
+
+    results = run(
+        content_sizes=parse_sizes(args.content_sizes),
+        signature_sizes=parse_dimensions(args.signature_sizes),
+        locales=[locale for locale in args.locales.split(",") if locale],
+        repeat=max(args.repeat, 1),
+        warmup=max(args.warmup, 0),
+    )
+
+    try:
+        from weasyprint import __version__ as weasyprint_version
+    except (ImportError, OSError):
+        weasyprint_version = None
+
+    output = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "weasyprint": weasyprint_version,
+            "two_layer": args.two_layer,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(output, indent=2), encoding="utf-8")
+    logger.info(f"✅ {len(results)} results written to {output_path}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.threshold)
+        for regression in regressions:
+            logger.error(f"❌ Regression {regression}")
+        if regressions:
+            sys.exit(1)
+        logger.info(f"✅ No regression over {args.threshold * 100:.0f}% against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
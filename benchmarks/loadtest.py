@@ -0,0 +1,304 @@
+"""
+Load Test Harness for Röchling Office API
+Seeds users, forms and guest book rows into the configured database and drives a weighted mix of requests
+against a running API at a fixed concurrency, reporting throughput and p50/p95/p99 latency per route.
+
+Hermetic run on SQLite (same .env for both processes):
+    DATABASE_URL=sqlite:///data/loadtest.db python benchmarks/loadtest.py seed --create-schema
+    DATABASE_URL=sqlite:///data/loadtest.db uvicorn src.app:app --port 8005
+    python benchmarks/loadtest.py run --base-url http://localhost:8005 --concurrency 20 --duration 60
+"""
+
+import datetime
+import argparse
+import logging
+import asyncio
+import random
+import time
+import json
+import sys
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlalchemy import select, func
+
+from src.database.models.guest_books import GuestBook, RENDER_STATE_DONE
+from src.monitoring.loop_watchdog import percentile
+from src.database.models.users import User
+from src.database.models.forms import Form
+from src.v1.guest_book.files import store_pdf
+from benchmarks.bench_pdf import build_form_content, build_signature
+from src.v1.forms.cache import normalize_form_name
+from src.database.base import Base
+from src.database import engine, SessionLocal
+from src.config import config
+from src.auth import hash_password
+
+LOCALES = ("cs", "en", "de")
+USERNAME_PREFIX = "loadtest"
+DEFAULT_PASSWORD = "LoadTest-2024"
+DEFAULT_MIX = "register=2,get-form=6,get-guest-book=1,download-form=3,login=1"
+SEED_PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def seed(users: int, guests: int, form_kb: int, password: str, create_schema: bool) -> None:
+    """Insert the load test data; existing users and forms are kept, so seeding can be repeated"""
+    if create_schema:
+        Base.metadata.create_all(engine)
+        logger.info("Schema created")
+
+    with SessionLocal() as db:
+        password_hash = hash_password(password)
+        existing = set(db.execute(select(User.username).where(User.username.like(f"{USERNAME_PREFIX}%"))).scalars())
+        for index in range(users):
+            username = f"{USERNAME_PREFIX}{index + 1}"
+            if username in existing:
+                continue
+            db.add(
+                User(
+                    username=username,
+                    first_name="Load",
+                    last_name=f"Test {index + 1}",
+                    email=f"{username}@example.com",
+                    password=password_hash,
+                    enabled=True,
+                    is_admin=False,
+                )
+            )
+        db.commit()
+
+        owner_id = db.execute(select(User.id).where(User.username == f"{USERNAME_PREFIX}1")).scalar_one()
+        content = build_form_content(form_kb)
+        existing = set(db.execute(select(Form.name)).scalars())
+        for locale in LOCALES:
+            for gdpr in (False, True):
+                name = normalize_form_name(locale, gdpr)
+                if name not in existing:
+                    db.add(Form(name=name, content=content, created_by=owner_id, updated_by=owner_id))
+        db.commit()
+
+        # Every seeded guest points to the same small PDF in the blob store
+        pdf_columns = store_pdf(SEED_PDF)
+        for index in range(guests):
+            db.add(
+                GuestBook(
+                    first_name="Seed",
+                    last_name=f"Guest {index + 1}",
+                    company=f"Company {index % 50}",
+                    phone="123456789",
+                    email=f"guest{index + 1}@example.com",
+                    render_state=RENDER_STATE_DONE,
+                    **pdf_columns,
+                )
+            )
+        db.commit()
+        total = db.execute(select(func.count(GuestBook.id))).scalar_one()
+
+    logger.info(f"✅ Seeded {users} users, {len(LOCALES) * 2} forms and {guests} guests ({total} guests in total)")
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: dict[str, int] = {}
+        self.errors = 0
+
+    def record(self, elapsed: float, status: str, ok: bool) -> None:
+        self.latencies.append(elapsed)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, duration: float) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, users: int, password: str, signature: str):
+        self.client = client
+        self.users = users
+        self.password = password
+        self.signature = signature
+        self.tokens: list[str] = []
+        self.guest_ids: list[int] = []
+        self.stats: dict[str, RouteStats] = {}
+
+    async def _login(self, username: str) -> httpx.Response:
+        return await self.client.post("/auth/login", data={"username": username, "password": self.password})
+
+    async def prepare(self) -> None:
+        for index in range(self.users):
+            response = await self._login(f"{USERNAME_PREFIX}{index + 1}")
+            response.raise_for_status()
+            self.tokens.append(response.json()["access_token"])
+
+        response = await self.client.get("/v1/guest-book/list", params={"limit": 500}, headers=self._auth())
+        response.raise_for_status()
+        self.guest_ids = [item["id"] for item in response.json()["items"] if item["render_state"] == RENDER_STATE_DONE]
+        if not self.guest_ids:
+            raise RuntimeError("No rendered guests found, run the seed command first")
+        logger.info(f"Logged in {len(self.tokens)} users, {len(self.guest_ids)} guests available for downloads")
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {random.choice(self.tokens)}"}
+
+    async def register(self) -> httpx.Response:
+        locale = random.choice(LOCALES)
+        payload = {
+            "name": "Load",
+            "surname": f"Tester{random.randint(1, 99999)}",
+            "acknowledged": True,
+            "gdpr": False,
+            "company": f"Company {random.randint(1, 50)}",
+            "phone": "123456789",
+            "email": "load.tester@example.com",
+            "signature": self.signature,
+            "locate": locale,
+            "header": f"Load test {locale}",
+        }
+        return await self.client.post("/v1/guest-book/register", json=payload)
+
+    async def get_form(self) -> httpx.Response:
+        params = {"locate": random.choice(LOCALES), "gdpr": random.random() < 0.5}
+        return await self.client.get("/v1/forms/get-form", params=params)
+
+    async def get_guest_book(self) -> httpx.Response:
+        return await self.client.get("/v1/guest-book/get-guest-book", headers=self._auth())
+
+    async def download_form(self) -> httpx.Response:
+        return await self.client.get(f"/v1/guest-book/download-form/{random.choice(self.guest_ids)}", headers=self._auth())
+
+    async def login(self) -> httpx.Response:
+        return await self._login(f"{USERNAME_PREFIX}{random.randint(1, self.users)}")
+
+    async def _call(self, route: str) -> None:
+        started = time.perf_counter()
+        try:
+            response = await getattr(self, route.replace("-", "_"))()
+            status, ok = str(response.status_code), response.status_code < 400
+        except httpx.HTTPError as e:
+            status, ok = type(e).__name__, False
+        self.stats.setdefault(route, RouteStats()).record(time.perf_counter() - started, status, ok)
+
+    async def _worker(self, routes: list[str], weights: list[float], deadline: float, remaining: list[int]) -> None:
+        while time.perf_counter() < deadline:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+            await self._call(random.choices(routes, weights)[0])
+
+    async def run(self, mix: dict[str, float], concurrency: int, duration: float, requests: int) -> float:
+        routes, weights = list(mix), list(mix.values())
+        started = time.perf_counter()
+        deadline = started + duration if duration > 0 else float("inf")
+        # Shared request budget, only decremented on the event loop thread
+        remaining = [requests if requests > 0 else sys.maxsize]
+        await asyncio.gather(*(self._worker(routes, weights, deadline, remaining) for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        route, weight = item.split("=")
+        route = route.strip()
+        if not hasattr(LoadTest, route.replace("-", "_")):
+            raise argparse.ArgumentTypeError(f"Unknown route '{route}'")
+        mix[route] = float(weight)
+    return mix
+
+
+async def run(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers={"API-KEY": config.API_KEY}, timeout=args.timeout, limits=limits
+    ) as client:
+        load_test = LoadTest(client, users=args.users, password=args.password, signature=build_signature(*args.signature_size))
+        await load_test.prepare()
+        logger.info(f"Running {args.concurrency} concurrent clients against {args.base_url}")
+        duration = await load_test.run(parse_mix(args.mix), args.concurrency, args.duration, args.requests)
+
+    report = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_seconds": round(duration, 2),
+            "mix": args.mix,
+        },
+        "routes": {route: stats.summary(duration) for route, stats in sorted(load_test.stats.items())},
+    }
+    total = sum(item["requests"] for item in report["routes"].values())
+    report["meta"]["throughput_rps"] = round(total / duration, 2) if duration else 0.0
+
+    logger.info(f"{'route':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, item in report["routes"].items():
+        logger.info(
+            f"{route:<16}{item['requests']:>10}{item['errors']:>8}{item['throughput_rps']:>10}"
+            f"{item['p50_ms']:>10}{item['p95_ms']:>10}{item['p99_ms']:>10}"
+        )
+    logger.info(f"✅ {total} requests in {duration:.1f} s, {report['meta']['throughput_rps']} requests/s")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Report written to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Röchling Office API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Insert load test users, forms and guests into the configured database")
+    seed_parser.add_argument("--users", type=int, default=10, help="Users to create (default: 10)")
+    seed_parser.add_argument("--guests", type=int, default=500, help="Guest book rows to create (default: 500)")
+    seed_parser.add_argument("--form-kb", type=int, default=10, help="Form content size in KB (default: 10)")
+    seed_parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of the load test users")
+    seed_parser.add_argument("--create-schema", action="store_true", help="Create missing tables first (SQLite)")
+
+    run_parser = commands.add_parser("run", help="Drive the request mix against a running API")
+    run_parser.add_argument("--base-url", default="http://localhost:8005", help="API base URL (default: http://localhost:8005)")
+    run_parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (default: 10)")
+    run_parser.add_argument("--duration", type=float, default=30.0, help="Run time in seconds, 0 = until --requests (default: 30)")
+    run_parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests, 0 = no limit")
+    run_parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Route weights (default: {DEFAULT_MIX})")
+    run_parser.add_argument("--users", type=int, default=10, help="Seeded users to log in with (default: 10)")
+    run_parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of the load test users")
+    run_parser.add_argument("--signature-size", type=lambda v: tuple(int(x) for x in v.lower().split("x")), default=(1200, 600))
+    run_parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout in seconds (default: 60)")
+    run_parser.add_argument("--output", help="Report JSON file")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        seed(users=args.users, guests=args.guests, form_kb=args.form_kb, password=args.password, create_schema=args.create_schema)
+    else:
+        if args.duration <= 0 and args.requests <= 0:
+            parser.error("either --duration or --requests must be set")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
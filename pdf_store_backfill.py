@@ -0,0 +1,83 @@
+"""
+Guest Book PDF Backfill for Röchling Office API
+Moves PDFs stored in the guest_book.pdf_file MEDIUMBLOB column into the content-addressed blob store.
+"""
+
+import argparse
+import logging
+import sys
+
+sys.stdout.reconfigure(encoding="utf-8")
+sys.stderr.reconfigure(encoding="utf-8")
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import update, select
+
+from src.database.models.guest_books import GuestBook
+from src.database import SessionLocal
+from src.storage import get_blob_store
+
+
+def backfill(batch_size: int, keep_blob: bool, dry_run: bool) -> int:
+    """Copy legacy PDFs batch by batch, keyed by id so every batch is a cheap range scan"""
+    store = get_blob_store()
+    last_id = 0
+    moved = 0
+    moved_bytes = 0
+
+    while True:
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(GuestBook.id, GuestBook.pdf_file)
+                .where(GuestBook.id > last_id, GuestBook.pdf_sha256.is_(None), GuestBook.pdf_file.is_not(None))
+                .order_by(GuestBook.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            for guest_book_id, pdf_file in rows:
+                last_id = guest_book_id
+                if dry_run:
+                    moved += 1
+                    moved_bytes += len(pdf_file)
+                    continue
+
+                stored = store.put(pdf_file)
+                values = {"pdf_sha256": stored.sha256, "pdf_size": stored.size, "pdf_storage": stored.backend}
+                if not keep_blob:
+                    values["pdf_file"] = None
+                db.execute(update(GuestBook).where(GuestBook.id == guest_book_id).values(**values))
+                moved += 1
+                moved_bytes += stored.size
+
+            if not dry_run:
+                db.commit()
+        logger.info(f"{'Checked' if dry_run else 'Moved'} {moved} PDFs ({moved_bytes / 1024 / 1024:.1f} MB), last id {last_id}")
+
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move guest book PDFs from the database to the blob store")
+    parser.add_argument("--batch-size", type=int, default=50, help="Rows loaded per batch (default: 50)")
+    parser.add_argument("--keep-blob", action="store_true", help="Keep the copy in guest_book.pdf_file")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be moved")
+    args = parser.parse_args()
+
+    moved = backfill(batch_size=args.batch_size, keep_blob=args.keep_blob, dry_run=args.dry_run)
+    logger.info(f"✅ Done, {moved} PDFs {'would be moved' if args.dry_run else 'moved'}")
+    if not args.dry_run and not args.keep_blob and moved:
+        logger.info("Run OPTIMIZE TABLE guest_book to return the freed space to the filesystem")
+
+
+if __name__ == "__main__":
+    main()
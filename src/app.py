@@ -1,15 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 from fastapi.responses import JSONResponse
 from fastapi import status, FastAPI, Depends
 
-from src.auth import verify_api_key
+from src.v1.guest_book.materializer import render_materializer
+from src.monitoring.loop_watchdog import loop_watchdog
+from src.v1.guest_book.renderer import render_pool
+from src.monitoring.profiling import request_profiler, ProfilingDisabledMiddleware, ProfilingMiddleware
+from src.monitoring.metrics import register_stats, MetricsMiddleware
+from src.monitoring.context import RequestContextMiddleware
+from src.auth.last_login import last_login_buffer
+from src.database import sync_pool_metrics, pool_metrics, async_engine, query_stats
+from src.logger import log_queue_handler
+from src.config import config
+from src.auth import password_hasher, verify_api_key, get_admin_user
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    render_pool.start()
+    if config.RENDER_WARM_UP:
+        render_pool.warm_up()
+    render_materializer.start()
+    last_login_buffer.start()
+    if config.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    yield
+    # Shutdown
+    await loop_watchdog.stop()
+    await last_login_buffer.stop()
+    render_materializer.shutdown()
+    render_pool.shutdown()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title="Roechling FastAPI",
     version="1.1.0",
     description="A simple API to interact with the Roechling database.",
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
 # app.docs_url = None
@@ -40,7 +74,9 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Routers
 from src.v1.guest_book.router import router as guest_book_router
+from src.monitoring.router import router as metrics_router
 from src.v1.forms.router import router as forms_router
+from src.v1.admin.router import router as admin_router
 from src.auth.router import router as auth_router
 
 # Auth router
@@ -49,3 +85,73 @@ app.include_router(auth_router, prefix="/auth", tags=["Auth"])
 app.include_router(guest_book_router, prefix="/v1/guest-book", tags=["Guest Book"], dependencies=[Depends(verify_api_key)])
 # Forms router
 app.include_router(forms_router, prefix="/v1/forms", tags=["Forms"], dependencies=[Depends(verify_api_key)])
+# Admin router
+app.include_router(admin_router, prefix="/v1/admin", tags=["Admin"], dependencies=[Depends(verify_api_key), Depends(get_admin_user)])
+
+# Metrics
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, routes_app=app)
+    app.include_router(metrics_router, tags=["Monitoring"], dependencies=[Depends(verify_api_key)])
+    register_stats(
+        "pdf_render_pool",
+        {"api": render_pool.stats},
+        gauges={
+            "in_flight": "Render jobs submitted and not finished",
+            "queued": "Render jobs waiting for a free worker",
+            "capacity": "Render jobs accepted at once (workers + queue size)",
+            "workers": "Render worker processes",
+        },
+        counters={
+            "submitted": "Render jobs submitted",
+            "completed": "Render jobs finished successfully",
+            "failed": "Render jobs failed or cancelled",
+            "rejected": "Render jobs rejected because the queue was full",
+            "timeouts": "Render jobs which did not finish in time",
+            "recycled": "Render pool restarts because a job hung past its deadline",
+        },
+    )
+    register_stats(
+        "pdf_render_background",
+        {"api": render_materializer.stats},
+        gauges={"queued": "Guest book rows waiting for background rendering"},
+        counters={"done": "Guest book PDFs rendered in the background", "failed": "Failed background renders"},
+    )
+    register_stats(
+        "log_queue",
+        {"api": log_queue_handler.stats},
+        gauges={"pending": "Log records waiting for the writer thread"},
+        counters={"queued": "Log records queued", "dropped": "Log records dropped because the queue was full"},
+    )
+    register_stats(
+        "db_pool",
+        {pool_metrics.name: pool_metrics.stats, sync_pool_metrics.name: sync_pool_metrics.stats},
+        label="engine",
+        gauges={
+            "pool.size": "Configured pool size",
+            "pool.checked_out": "Connections in use",
+            "pool.checked_in": "Idle connections in the pool",
+            "pool.overflow": "Connections open above the pool size",
+        },
+        counters={
+            "connects": "New database connections",
+            "checkouts": "Connection checkouts",
+            "invalidations": "Invalidated connections",
+            "checkout_timeouts": "Checkouts which timed out waiting for the pool",
+            "checkout_wait_seconds": "Total time requests waited for a connection",
+        },
+    )
+
+# Request profiling (admin flag or 1 in N requests)
+if config.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, routes_app=app, profiler=request_profiler)
+else:
+    app.add_middleware(ProfilingDisabledMiddleware)
+
+# Request context (request id, route, SQL statistics), added last so it wraps all other middleware
+sql_instrumentation = config.SQL_INSTRUMENTATION_ENABLED
+app.add_middleware(
+    RequestContextMiddleware,
+    routes_app=app,
+    response_hooks=[query_stats.response_headers] if sql_instrumentation and config.SQL_RESPONSE_HEADERS else [],
+    finish_hooks=[query_stats.finish_request] if sql_instrumentation else [],
+)
@@ -2,19 +2,25 @@ import datetime
 from typing import Optional
 
 import pytz
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
-from fastapi import status, HTTPException, APIRouter, Depends, Header
+from fastapi import status, HTTPException, APIRouter, Request, Depends, Header
 from jose import jwt, JWTError
 
 from src.database.models.users import User
+from src.auth.token_cache import VerifiedTokenCache
 from src.auth.schemas import *
+from src.auth.hashing import PasswordHasherBusyError, PasswordHasher
 from src.config import config
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(workers=config.PASSWORD_HASH_WORKERS, max_pending=config.PASSWORD_HASH_MAX_PENDING)
+
+# Verified JWT cache
+token_cache = VerifiedTokenCache(max_entries=config.JWT_CACHE_MAX_ENTRIES)
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -36,28 +42,61 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def get_user(db: Session, username: str) -> User | None:
-    user = db.execute(select(User).where(and_(User.username == username, User.enabled == 1))).scalar_one_or_none()
+async def _run_password_hasher(fn, *args):
+    try:
+        return await password_hasher.run(fn, *args)
+    except PasswordHasherBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again later.",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    # bcrypt runs on the password hashing pool, never on the event loop
+    return await _run_password_hasher(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_hasher(verify_password, plain_password, hashed_password)
+
+
+async def get_user(db: AsyncSession, username: str) -> User | None:
+    user = (await db.execute(select(User).where(and_(User.username == username, User.enabled == 1)))).scalar_one_or_none()
     if user:
         return user
     return None
 
 
-def authenticate_user(db: Session, username: str, password: str) -> User | None:
-    user = get_user(db, username)
-    if not user or not verify_password(password, user.password):
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> User | None:
+    user = await get_user(db, username)
+    if not user or not await verify_password_async(password, user.password):
         return None
     return user
 
 
-def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None):
+def issue_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None) -> tuple[str, AuthUser]:
     to_encode = data.copy()
     expire = datetime.datetime.now(pytz.utc) + (expires_delta if expires_delta else datetime.timedelta(minutes=15))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    token = jwt.encode(to_encode, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    # The claims are known already, no need to decode the token just minted
+    user = AuthUser(**data, exp=int(expire.timestamp()))
+    token_cache.set(token, user)
+    return token, user
 
 
-async def get_auth_user(token: str = Depends(oauth2_scheme)) -> AuthUser:
+def create_access_token(data: dict, expires_delta: Optional[datetime.timedelta] = None):
+    return issue_access_token(data, expires_delta)[0]
+
+
+def verify_token(token: str) -> AuthUser:
+    # Signature check only for tokens not seen before
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -74,11 +113,21 @@ async def get_auth_user(token: str = Depends(oauth2_scheme)) -> AuthUser:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    return AuthUser(**payload)
+    user = AuthUser(**payload)
+    token_cache.set(token, user)
+    return user
+
+
+async def get_auth_user(request: Request, token: str = Depends(oauth2_scheme)) -> AuthUser:
+    # Verified at most once per request, however many dependencies ask for the user
+    user = getattr(request.state, "auth_user", None)
+    if user is None:
+        user = verify_token(token)
+        request.state.auth_user = user
+    return user
 
 
-async def get_admin_user(token: str = Depends(oauth2_scheme)) -> AuthUser:
-    user = await get_auth_user(token)
+async def get_admin_user(user: AuthUser = Depends(get_auth_user)) -> AuthUser:
     if not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
     return user
@@ -89,7 +138,7 @@ async def get_optional_auth_user(token: Optional[str] = Depends(optional_oauth2)
         return None
     try:
         # Your token validation logic here
-        return await get_auth_user(token)
+        return verify_token(token)
     except Exception:
         return None  # Don't raise here if optional
 
@@ -0,0 +1,93 @@
+import concurrent.futures
+import threading
+import asyncio
+import time
+import os
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a dedicated thread pool.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real parallelism without pickling
+    overhead, and the event loop stays free. At most ``max_pending`` calls may wait or run at once.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_pending = max(max_pending, self.workers)
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "calls": 0,
+            "rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "queue_wait_max_seconds": 0.0,
+            "run_seconds": 0.0,
+            "run_max_seconds": 0.0,
+        }
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _record(self, queue_wait: float, run: float) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["queue_wait_seconds"] += queue_wait
+            self._stats["queue_wait_max_seconds"] = max(self._stats["queue_wait_max_seconds"], queue_wait)
+            self._stats["run_seconds"] += run
+            self._stats["run_max_seconds"] = max(self._stats["run_max_seconds"], run)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise PasswordHasherBusyError("Too many password hashing requests")
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self._record(started - submitted, time.perf_counter() - started)
+
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(job))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, pending=self._pending)
+        calls = stats["calls"]
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": stats["pending"],
+            "calls": calls,
+            "rejected": stats["rejected"],
+            "queue_wait_avg_ms": round(stats["queue_wait_seconds"] / calls * 1000, 3) if calls else 0.0,
+            "queue_wait_max_ms": round(stats["queue_wait_max_seconds"] * 1000, 3),
+            "run_avg_ms": round(stats["run_seconds"] / calls * 1000, 3) if calls else 0.0,
+            "run_max_ms": round(stats["run_max_seconds"] * 1000, 3),
+        }
@@ -0,0 +1,97 @@
+import threading
+import datetime
+import asyncio
+import time
+
+from sqlalchemy import update, select, func, case
+
+from src.database.models.users import User
+from src.database import async_engine
+from src.logger import app_logger
+from src.config import config
+
+
+class LastLoginBuffer:
+    """Write-behind buffer for ``users.last_login``.
+
+    Logins only record the timestamp in memory; a background task writes all buffered users in one
+    ``UPDATE ... SET last_login = CASE id ...`` every ``flush_interval`` seconds and once more on shutdown.
+    Timestamps are taken from the database clock at flush time minus the age of each login, so they keep the
+    time zone semantics of ``func.now()``.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        # user id -> time.monotonic() of the last login
+        self._pending: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+        self._stats = {"recorded": 0, "flushes": 0, "rows_flushed": 0, "failed_flushes": 0}
+
+    def record(self, user_id: int) -> None:
+        with self._lock:
+            self._pending[user_id] = time.monotonic()
+            self._stats["recorded"] += 1
+
+    async def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        try:
+            async with async_engine.begin() as connection:
+                db_now = (await connection.execute(select(func.current_timestamp()))).scalar_one()
+                now = time.monotonic()
+                last_logins = {user_id: db_now - datetime.timedelta(seconds=now - recorded) for user_id, recorded in pending.items()}
+                await connection.execute(
+                    update(User.__table__).where(User.id.in_(list(pending))).values(last_login=case(last_logins, value=User.id))
+                )
+        except asyncio.CancelledError:
+            self._requeue(pending)
+            raise
+        except Exception as e:
+            app_logger.exception(e)
+            self._requeue(pending)
+            return
+
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += len(pending)
+
+    def _requeue(self, pending: dict[int, float]) -> None:
+        # Put the timestamps back unless a newer login was recorded meanwhile
+        with self._lock:
+            for user_id, recorded in pending.items():
+                self._pending.setdefault(user_id, recorded)
+            self._stats["failed_flushes"] += 1
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        # The task is not cancelled, a running flush completes and the loop ends with a final flush
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        else:
+            await self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending), flush_interval_seconds=self.flush_interval)
+
+
+last_login_buffer = LastLoginBuffer(flush_interval=config.LAST_LOGIN_FLUSH_SECONDS)
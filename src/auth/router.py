@@ -1,12 +1,13 @@
 from datetime import timedelta
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.sql import func
-from sqlalchemy.orm import Session
 from sqlalchemy import select
 from fastapi import status, HTTPException, APIRouter, Depends
 
 from src.database.models.users import User
+from src.auth.last_login import last_login_buffer
 from src.auth.schemas import (
     AuthUserListResponseModel,
     AuthChangePasswordModel,
@@ -18,7 +19,15 @@ from src.auth.schemas import (
 )
 from src.database import get_db
 from src.config import config
-from src.auth import create_access_token, authenticate_user, verify_password, format_username, get_admin_user, hash_password, get_auth_user
+from src.auth import (
+    verify_password_async,
+    hash_password_async,
+    issue_access_token,
+    authenticate_user,
+    format_username,
+    get_admin_user,
+    get_auth_user,
+)
 
 # Router
 router = APIRouter()
@@ -30,25 +39,23 @@ router = APIRouter()
     name="Login",
     response_model=AuthLoginResponse,
 )
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, format_username(form_data.username), form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, format_username(form_data.username), form_data.password)
     if not user or not isinstance(user, User):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    # Update last login time
-    user.last_login = func.now()
-    # Commit changes
-    db.commit()
+    # Update last login time (written in batches by the last login buffer)
+    last_login_buffer.record(user.id)
     # Expires Token
     if "remember_me" in form_data.scopes:
         access_token_expires = timedelta(days=config.JWT_ACCESS_TOKEN_EXPIRE_DAYS)
     else:
         access_token_expires = timedelta(minutes=config.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     # Generate Access Token
-    access_token = create_access_token(
+    access_token, auth_user = issue_access_token(
         data={
             "id": user.id,
             "username": user.username,
@@ -60,7 +67,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         expires_delta=access_token_expires,
     )
     # Return Token
-    return {"success": True, "access_token": access_token, "user": await get_auth_user(token=access_token)}
+    return {"success": True, "access_token": access_token, "user": auth_user}
 
 
 @router.get(
@@ -82,16 +89,16 @@ async def get_user(user: AuthUser = Depends(get_auth_user)):
     dependencies=[Depends(get_auth_user)],
     response_model=dict[str, bool],
 )
-async def change_user_password(data: AuthChangePasswordModel, db: Session = Depends(get_db), user: AuthUser = Depends(get_auth_user)):
+async def change_user_password(data: AuthChangePasswordModel, db: AsyncSession = Depends(get_db), user: AuthUser = Depends(get_auth_user)):
     # Get User
-    db_user = db.execute(select(User).where(User.username == user.username)).scalar_one_or_none()
+    db_user = (await db.execute(select(User).where(User.username == user.username))).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     # Verify old password
-    if not verify_password(data.old_password, db_user.password):
+    if not await verify_password_async(data.old_password, db_user.password):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Incorrect password",
@@ -99,11 +106,11 @@ async def change_user_password(data: AuthChangePasswordModel, db: Session = Depe
         )
 
     # Hash new password
-    db_user.password = hash_password(data.confirm_password)
+    db_user.password = await hash_password_async(data.confirm_password)
     db_user.updated_at = func.now()
 
     # Commit changes
-    db.commit()
+    await db.commit()
 
     # Return Success
     return {"success": True}
@@ -116,9 +123,9 @@ async def change_user_password(data: AuthChangePasswordModel, db: Session = Depe
     dependencies=[Depends(get_auth_user)],
     response_model=dict[str, bool],
 )
-async def edit_user(data: AuthEditUserModel, db: Session = Depends(get_db), user: AuthUser = Depends(get_auth_user)):
+async def edit_user(data: AuthEditUserModel, db: AsyncSession = Depends(get_db), user: AuthUser = Depends(get_auth_user)):
     # Get User
-    db_user = db.execute(select(User).where(User.username == user.username)).scalar_one_or_none()
+    db_user = (await db.execute(select(User).where(User.username == user.username))).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -132,7 +139,7 @@ async def edit_user(data: AuthEditUserModel, db: Session = Depends(get_db), user
     db_user.updated_at = func.now()
 
     # Commit changes
-    db.commit()
+    await db.commit()
 
     # Return Success
     return {"success": True}
@@ -145,9 +152,9 @@ async def edit_user(data: AuthEditUserModel, db: Session = Depends(get_db), user
     dependencies=[Depends(get_admin_user)],
     response_model=list[AuthUserListResponseModel],
 )
-async def update_user(db: Session = Depends(get_db), user: AuthUser = Depends(get_admin_user)):
+async def update_user(db: AsyncSession = Depends(get_db), user: AuthUser = Depends(get_admin_user)):
     # Get User
-    db_users = db.execute(select(User)).scalars().all()
+    db_users = (await db.execute(select(User))).scalars().all()
     # Return Success
     return db_users
 
@@ -159,9 +166,9 @@ async def update_user(db: Session = Depends(get_db), user: AuthUser = Depends(ge
     dependencies=[Depends(get_admin_user)],
     response_model=dict[str, bool],
 )
-async def add_user(data: AuthRegisterModel, db: Session = Depends(get_db)):
+async def add_user(data: AuthRegisterModel, db: AsyncSession = Depends(get_db)):
     # Validate if User Exists
-    user_exists = db.execute(select(User).where(User.username == format_username(data.username))).scalar_one_or_none()
+    user_exists = (await db.execute(select(User).where(User.username == format_username(data.username)))).scalar_one_or_none()
     if user_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -171,14 +178,14 @@ async def add_user(data: AuthRegisterModel, db: Session = Depends(get_db)):
     # Create a new User
     user = User(
         username=format_username(data.username),
-        password=hash_password(data.password),
+        password=await hash_password_async(data.password),
         first_name=data.first_name,
         last_name=data.last_name,
         email=data.email,
         enabled=True,
     )
     db.add(user)
-    db.commit()
+    await db.commit()
 
     # Return Success
     return {"success": True}
@@ -191,9 +198,9 @@ async def add_user(data: AuthRegisterModel, db: Session = Depends(get_db)):
     dependencies=[Depends(get_admin_user)],
     response_model=dict[str, bool],
 )
-async def reset_user_password(data: AuthResetPasswordModel, db: Session = Depends(get_db)):
+async def reset_user_password(data: AuthResetPasswordModel, db: AsyncSession = Depends(get_db)):
     # Get User
-    db_user = db.execute(select(User).where(User.username == data.username)).scalar_one_or_none()
+    db_user = (await db.execute(select(User).where(User.username == data.username))).scalar_one_or_none()
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -201,11 +208,11 @@ async def reset_user_password(data: AuthResetPasswordModel, db: Session = Depend
         )
 
     # Hash new password
-    db_user.password = hash_password(data.confirm_password)
+    db_user.password = await hash_password_async(data.confirm_password)
     db_user.updated_at = func.now()
 
     # Commit changes
-    db.commit()
+    await db.commit()
 
     # Return Success
     return {"success": True}
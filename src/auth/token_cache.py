@@ -0,0 +1,60 @@
+import collections
+import threading
+import hashlib
+import time
+
+from src.auth.schemas import AuthUser
+
+
+class VerifiedTokenCache:
+    """LRU cache of already verified JWTs.
+
+    Keys are SHA-256 digests of the token, so raw tokens are not kept in memory. An entry is valid only
+    until the token's own ``exp`` claim, a cached token can never outlive its signature check.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[bytes, AuthUser] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> AuthUser | None:
+        if self.max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            user = self._entries.get(key)
+            if user is None:
+                self._stats["misses"] += 1
+                return None
+            if user.exp <= time.time():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return user
+
+    def set(self, token: str, user: AuthUser) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = user
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
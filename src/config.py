@@ -14,10 +14,16 @@ class Config(BaseSettings):
     API_KEY: str
 
     # Database
-    DATABASE_HOST: str
-    DATABASE_NAME: str
-    DATABASE_USER: str
-    DATABASE_SECRET: str
+    DATABASE_URL: str = ""  # overrides the MySQL settings below, e.g. sqlite:///data/loadtest.db
+    DATABASE_HOST: str = ""
+    DATABASE_NAME: str = ""
+    DATABASE_USER: str = ""
+    DATABASE_SECRET: str = ""
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
 
     # Paths
     ROOT_PATH: str
@@ -27,12 +33,75 @@ class Config(BaseSettings):
     # Logs
     GLOBAL_LOG_PATH: str = ""
     APP_LOG_PATH: str = ""
+    LOOP_STALL_LOG_PATH: str = ""
+    PROFILES_PATH: str = ""
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line with request id, route and latency)
+    LOG_QUEUE_SIZE: int = 10000  # records waiting for the writer thread, further records are dropped, 0 = unbounded
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024  # global.log and app.log are rotated at this size, 0 = time only
+    LOG_ROTATE_WHEN: str = "midnight"  # "midnight", "hourly" or "never"
+    LOG_COMPRESSION: str = "gzip"  # rotated segments: "gzip", "zstd" (needs the zstandard package) or "none"
+    LOG_RETENTION_BYTES: int = 1024 * 1024 * 1024  # rotated segments of both logs together, oldest deleted first, 0 = keep all
+
+    # Templates
+    TEMPLATES_PATH: str = ""
+    TEMPLATES_CACHE_PATH: str = ""
+    TEMPLATES_BYTECODE_CACHE: bool = True
+    FONTS_PATH: str = ""
+
+    # Blob Store
+    BLOB_STORE_BACKEND: str = "local"
+    BLOB_STORE_PATH: str = ""
+
+    # PDF Rendering
+    RENDER_WORKERS: int = 0  # 0 = one worker per CPU core
+    RENDER_QUEUE_SIZE: int = 16
+    RENDER_TIMEOUT_SECONDS: float = 30.0
+    RENDER_RETRY_AFTER_SECONDS: int = 5
+    RENDER_KILL_GRACE_SECONDS: float = 5.0  # a job running this long past its timeout gets the render workers recycled
+    RENDER_BACKGROUND_WORKERS: int = 2
+    RENDER_LEASE_SECONDS: float = 300.0  # claim on a background render, taken over by another worker once expired
+    RENDER_WARM_UP: bool = True  # render a sample PDF in every worker at startup
+    RENDER_TWO_LAYER: bool = False  # cache the form text layout, the guest section then starts on a new page
+    RENDER_LAYER_CACHE_MAX_ENTRIES: int = 16  # form text layouts kept per render worker
+
+    # Forms
+    FORM_CACHE_TTL_SECONDS: float = 60.0  # 0 = disabled
+    FORM_CACHE_MAX_ENTRIES: int = 64
+
+    # Monitoring
+    METRICS_ENABLED: bool = True  # Prometheus /metrics endpoint and request metrics
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_INTERVAL_MS: int = 100
+    LOOP_WATCHDOG_THRESHOLD_MS: int = 250
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 10  # same statement this often in one request is reported as N+1, 0 = off
+    SQL_RESPONSE_HEADERS: bool = True  # X-DB-Query-Count and X-DB-Time-Ms
+    PROFILING_ENABLED: bool = False  # installs the request profiling middleware
+    PROFILING_SAMPLE_EVERY: int = 0  # profile 1 in N requests without a flag, 0 = only on admin request
+    PROFILING_SAMPLE_MODE: str = "sample"  # "sample" (stack sampling) or "cprofile" (deterministic)
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_FILES: int = 200  # oldest profile files are deleted above this count
+
+    # Guest Book
+    GUEST_BOOK_ASYNC_RENDER: bool = False  # store the registration at once and render the PDF in the background
+    SIGNATURE_MAX_BYTES: int = 2 * 1024 * 1024  # length of the signature data URL
+    SIGNATURE_MAX_PIXELS: int = 4_000_000
+    SIGNATURE_BOX_WIDTH: int = 240  # size of the .signature box in the form template, CSS px
+    SIGNATURE_BOX_HEIGHT: int = 120
+    SIGNATURE_SCALE: float = 2.0  # pixels per CSS px kept for print quality
 
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int
     JWT_ACCESS_TOKEN_EXPIRE_DAYS: int
+    JWT_CACHE_MAX_ENTRIES: int = 1024  # 0 = disabled
+    LAST_LOGIN_FLUSH_SECONDS: float = 10.0
+
+    # Password Hashing
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one thread per CPU core
+    PASSWORD_HASH_MAX_PENDING: int = 64
 
     def init(self):
         # Paths
@@ -42,6 +111,16 @@ class Config(BaseSettings):
         # Logs
         self.GLOBAL_LOG_PATH = os.path.join(self.LOGS_PATH, "global.log")
         self.APP_LOG_PATH = os.path.join(self.LOGS_PATH, "app.log")
+        self.LOOP_STALL_LOG_PATH = os.path.join(self.LOGS_PATH, "loop_stalls.log")
+        self.PROFILES_PATH = os.path.join(self.LOGS_PATH, "profiles")
+
+        # Blob Store
+        self.BLOB_STORE_PATH = self.BLOB_STORE_PATH or os.path.join(self.DATA_PATH, "blobs")
+
+        # Templates
+        self.TEMPLATES_PATH = self.TEMPLATES_PATH or os.path.join(self.ROOT_PATH, "templates")
+        self.TEMPLATES_CACHE_PATH = os.path.join(self.DATA_PATH, "template_cache")
+        self.FONTS_PATH = self.FONTS_PATH or os.path.join(self.ROOT_PATH, "fonts")
 
         # Init Paths
         os.makedirs(self.LOGS_PATH, exist_ok=True)
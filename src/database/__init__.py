@@ -1,33 +1,90 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy import create_engine, make_url, event, MetaData
 
+from src.database.query_timing import time_queries
+from src.database.pool_metrics import PoolMetrics
+from src.database.query_stats import QueryStats
+from src.monitoring.metrics import observe_query
 from src.config import config
 
 # Init Metadata
 metadata = MetaData()
 
+# Async driver for every supported sync driver
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
 # Database Instance
-DATABASE_URL = (
+DATABASE_URL = config.DATABASE_URL or (
     f"mysql+pymysql://{config.DATABASE_USER}:{config.DATABASE_SECRET}@{config.DATABASE_HOST}/{config.DATABASE_NAME}?charset=utf8mb4"
 )
+_url = make_url(DATABASE_URL)
+if _url.drivername not in ASYNC_DRIVERS:
+    raise ValueError(f"Unsupported database driver '{_url.drivername}'")
+ASYNC_DATABASE_URL = _url.set(drivername=ASYNC_DRIVERS[_url.drivername]).render_as_string(hide_password=False)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
 
-# Create Engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # FIX dead connections
-    pool_recycle=1800,  # FIX MySQL idle timeout (30 min)
-    # pool_size=10,
-    # max_overflow=20,
-)
+# Pool options shared by both engines
+POOL_OPTIONS = {
+    "pool_size": config.DATABASE_POOL_SIZE,
+    "max_overflow": config.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": config.DATABASE_POOL_TIMEOUT,
+    "pool_recycle": config.DATABASE_POOL_RECYCLE,  # FIX MySQL idle timeout
+    "pool_pre_ping": config.DATABASE_POOL_PRE_PING,  # FIX dead connections
+}
+
+# Create Engine (sync: Alembic, background workers and command line tools)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
+
+# Create Async Engine (API requests)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+
+
+def _on_sqlite_connect(dbapi_connection, connection_record) -> None:
+    # WAL lets readers run next to the single writer, the busy timeout makes writers wait instead of failing
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _on_sqlite_connect)
+    event.listen(async_engine.sync_engine, "connect", _on_sqlite_connect)
+
+# Pool Metrics
+pool_metrics = PoolMetrics("async")
+pool_metrics.attach(async_engine.sync_engine)
+sync_pool_metrics = PoolMetrics("sync")
+sync_pool_metrics.attach(engine)
+
+# Query Metrics and Statistics (per request counts, slow queries, repeated statements), one timing listener
+query_stats = QueryStats(slow_query_ms=config.SQL_SLOW_QUERY_MS, repeated_threshold=config.SQL_REPEATED_STATEMENT_THRESHOLD)
+query_observers = [observe_query, query_stats.record] if config.SQL_INSTRUMENTATION_ENABLED else [observe_query]
+time_queries(async_engine.sync_engine, "async", query_observers)
+time_queries(engine, "sync", query_observers)
 
 # Create Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit, lazy refresh is not possible in async code
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
 
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_db():
+    # The connection is checked out on the first statement, requests served from caches never take one
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            # Endpoints turn errors into an HTTPException, the pool timeout is then its context
+            if isinstance(e, PoolTimeoutError) or isinstance(e.__context__, PoolTimeoutError):
+                pool_metrics.record_checkout_timeout()
+            raise
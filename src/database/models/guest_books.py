@@ -1,22 +1,46 @@
-from sqlalchemy.dialects.mysql import BIGINT, MEDIUMBLOB
+import datetime
+
 from sqlalchemy.sql import func
 from sqlalchemy.orm import mapped_column, Mapped
-from sqlalchemy import String, TIMESTAMP
+from sqlalchemy import DateTime, String, Index, TIMESTAMP
 
+from src.database.types import UnsignedBigInteger, MediumBlob, LongText
 from src.database.base import Base
 
+# PDF render states
+RENDER_STATE_PENDING = "pending"
+RENDER_STATE_RENDERING = "rendering"  # claimed by a materializer until render_lease_until
+RENDER_STATE_DONE = "done"
+RENDER_STATE_FAILED = "failed"
+# Error code shown to clients for failed renders, the cause stays in render_error and app.log
+RENDER_ERROR_CODE = "render_failed"
+
 
 class GuestBook(Base):
     __tablename__ = "guest_book"
+    __table_args__ = (
+        Index("ix_guest_book_created_at_id", "created_at", "id"),
+        Index("ix_guest_book_company_created_at", "company", "created_at"),
+        Index("ix_guest_book_last_name", "last_name"),
+        Index("ix_guest_book_first_name", "first_name"),
+    )
 
-    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(UnsignedBigInteger, primary_key=True, autoincrement=True)
     created_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
     first_name: Mapped[str] = mapped_column(String(255), nullable=False)
     last_name: Mapped[str] = mapped_column(String(255), nullable=False)
     company: Mapped[str] = mapped_column(String(255), nullable=False)
     phone: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=True)
-    pdf_file: Mapped[bytes] = mapped_column(MEDIUMBLOB, nullable=False)
+    pdf_file: Mapped[bytes] = mapped_column(MediumBlob, nullable=True)  # legacy storage, moved to the blob store by pdf_store_backfill.py
+    pdf_sha256: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
+    pdf_size: Mapped[int] = mapped_column(UnsignedBigInteger, nullable=True)
+    pdf_storage: Mapped[str] = mapped_column(String(20), nullable=True)
+    render_state: Mapped[str] = mapped_column(String(20), nullable=False, server_default=RENDER_STATE_DONE, index=True)
+    render_error: Mapped[str] = mapped_column(String(1000), nullable=True)
+    submission: Mapped[str] = mapped_column(LongText, nullable=True)  # raw registration kept until the PDF is rendered
+    render_owner: Mapped[str] = mapped_column(String(64), nullable=True)
+    render_lease_until: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=True)  # UTC
 
     def to_dict(self):
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
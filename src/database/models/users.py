@@ -1,15 +1,15 @@
-from sqlalchemy.dialects.mysql import VARCHAR, BOOLEAN, BIGINT
 from sqlalchemy.sql import func
 from sqlalchemy.orm import mapped_column, Mapped
 from sqlalchemy import String, TIMESTAMP
 
+from src.database.types import UnsignedBigInteger, Bool
 from src.database.base import Base
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[int] = mapped_column(BIGINT(unsigned=True), primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(UnsignedBigInteger, primary_key=True, autoincrement=True)
     created_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
     updated_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
     last_login: Mapped[str] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
@@ -18,6 +18,6 @@ class User(Base):
     last_name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
-    remember_token: Mapped[str] = mapped_column(VARCHAR(100), nullable=True)
-    enabled: Mapped[bool] = mapped_column(BOOLEAN(), nullable=False, default=True)
-    is_admin: Mapped[bool] = mapped_column(BOOLEAN(), nullable=False, default=False)
+    remember_token: Mapped[str] = mapped_column(String(100), nullable=True)
+    enabled: Mapped[bool] = mapped_column(Bool, nullable=False, default=True)
+    is_admin: Mapped[bool] = mapped_column(Bool, nullable=False, default=False)
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from sqlalchemy.orm import Session
+from sqlalchemy import event, Engine
+
+# Session.info key, set when a session without a transaction starts a statement or a flush
+_CHECKOUT_STARTED = "pool_checkout_started"
+
+
+class PoolMetrics:
+    """Connection pool counters collected from SQLAlchemy pool events.
+
+    ``checkout_wait`` is the time a session waited for its first connection (queueing for a free slot,
+    connecting and the pre-ping included). It is measured from session events when the session first needs a
+    connection, sessions which never run a statement never check one out. Pool timeouts are counted by
+    ``get_db``.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self.pool = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "connects": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "soft_invalidations": 0,
+            "overflow_checkouts": 0,
+            "max_overflow_used": 0,
+            "max_checked_out": 0,
+            "checkout_timeouts": 0,
+            "checkout_waits": 0,
+            "checkout_wait_seconds": 0.0,
+            "checkout_wait_max_seconds": 0.0,
+        }
+
+    def attach(self, engine: Engine) -> None:
+        self.engine = engine
+        self.pool = engine.pool
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_soft_invalidate)
+        # All sessions, only those bound to this engine are timed
+        event.listen(Session, "do_orm_execute", self._on_session_execute)
+        event.listen(Session, "before_flush", self._on_session_flush)
+        event.listen(Session, "after_begin", self._on_session_begin)
+
+    def _increment(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self._increment("connects")
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        overflow = self.pool.overflow() if hasattr(self.pool, "overflow") else 0
+        checked_out = self.pool.checkedout() if hasattr(self.pool, "checkedout") else 0
+        with self._lock:
+            self._stats["checkouts"] += 1
+            if overflow > 0:
+                self._stats["overflow_checkouts"] += 1
+            self._stats["max_overflow_used"] = max(self._stats["max_overflow_used"], overflow)
+            self._stats["max_checked_out"] = max(self._stats["max_checked_out"], checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self._increment("checkins")
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self._increment("invalidations")
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self._increment("soft_invalidations")
+
+    def _start_checkout(self, session: Session) -> None:
+        if not session.in_transaction() and _CHECKOUT_STARTED not in session.info and session.bind is self.engine:
+            session.info[_CHECKOUT_STARTED] = time.perf_counter()
+
+    def _on_session_execute(self, orm_execute_state) -> None:
+        self._start_checkout(orm_execute_state.session)
+
+    def _on_session_flush(self, session: Session, flush_context, instances) -> None:
+        self._start_checkout(session)
+
+    def _on_session_begin(self, session: Session, transaction, connection) -> None:
+        if connection.engine is not self.engine:
+            return
+        started = session.info.pop(_CHECKOUT_STARTED, None)
+        if started is not None:
+            self.record_checkout_wait(time.perf_counter() - started)
+
+    def record_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._stats["checkout_waits"] += 1
+            self._stats["checkout_wait_seconds"] += seconds
+            self._stats["checkout_wait_max_seconds"] = max(self._stats["checkout_wait_max_seconds"], seconds)
+
+    def record_checkout_timeout(self) -> None:
+        self._increment("checkout_timeouts")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        waits = stats["checkout_waits"]
+        stats["checkout_wait_avg_ms"] = round(stats["checkout_wait_seconds"] / waits * 1000, 3) if waits else 0.0
+        stats["checkout_wait_max_ms"] = round(stats.pop("checkout_wait_max_seconds") * 1000, 3)
+
+        # Current pool state
+        if self.pool is not None:
+            stats["pool"] = {
+                "class": type(self.pool).__name__,
+                "size": self.pool.size() if hasattr(self.pool, "size") else None,
+                "checked_in": self.pool.checkedin() if hasattr(self.pool, "checkedin") else None,
+                "checked_out": self.pool.checkedout() if hasattr(self.pool, "checkedout") else None,
+                "overflow": self.pool.overflow() if hasattr(self.pool, "overflow") else None,
+            }
+        return stats
@@ -0,0 +1,132 @@
+import collections
+import threading
+import datetime
+import re
+
+from src.monitoring.context import current_request, RequestContext
+from src.logger import app_logger
+
+STATEMENT_LOG_LENGTH = 1000
+# Literals and bound parameter lists, so "IN (?, ?)" and "IN (?, ?, ?)" count as the same statement
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST_PATTERN = re.compile(r"\(\s*(?:(?:\?|%s|%\(\w+\)s)\s*,\s*)*(?:\?|%s|%\(\w+\)s)\s*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE_PATTERN.sub(" ", statement).strip()
+    statement = _LITERAL_PATTERN.sub("?", statement)
+    return _PARAMETER_LIST_PATTERN.sub("(?+)", statement)
+
+
+def _value_shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return f"str[{len(value)}]"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"bytes[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    # Types and sizes only, parameter values may contain personal data
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_value_shape(value) for value in parameters) + ")"
+    return _value_shape(parameters)
+
+
+class QueryStats:
+    """SQL statement statistics, an observer of ``src.database.query_timing``.
+
+    Statements are attributed to the current request (``RequestContext``), logged when slower than
+    ``slow_query_ms`` and requests executing one normalized statement ``repeated_threshold`` times or more
+    are reported as a likely N+1 pattern.
+    """
+
+    def __init__(self, slow_query_ms: float, repeated_threshold: int, max_reports: int = 50):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.repeated_threshold = repeated_threshold
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "query_seconds": 0.0, "slow_queries": 0, "repeated_statement_requests": 0}
+        self._repeated: collections.deque[dict] = collections.deque(maxlen=max_reports)
+        self._slow: collections.deque[dict] = collections.deque(maxlen=max_reports)
+
+    def record(self, engine_name: str, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+        request = current_request()
+        if request is not None:
+            request.db_queries += 1
+            request.db_seconds += elapsed
+            request.db_statements[normalize_statement(statement)] += 1
+
+        slow = elapsed >= self.slow_query_seconds
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["query_seconds"] += elapsed
+            if slow:
+                self._stats["slow_queries"] += 1
+
+        if slow:
+            shape = parameter_shape(parameters, executemany)
+            route = f"{request.method} {request.route}" if request is not None else "-"
+            request_id = request.request_id if request is not None else "-"
+            app_logger.warning(
+                f"Slow query {elapsed * 1000:.1f} ms [{engine_name}] route={route} request_id={request_id} "
+                f"params={shape} sql={_WHITESPACE_PATTERN.sub(' ', statement)[:STATEMENT_LOG_LENGTH]}"
+            )
+            with self._lock:
+                self._slow.append(
+                    {
+                        "at": datetime.datetime.now().isoformat(timespec="seconds"),
+                        "engine": engine_name,
+                        "route": route,
+                        "request_id": request_id,
+                        "ms": round(elapsed * 1000, 1),
+                        "params": shape,
+                        "statement": normalize_statement(statement)[:STATEMENT_LOG_LENGTH],
+                    }
+                )
+
+    def response_headers(self, request: RequestContext) -> list[tuple[bytes, bytes]]:
+        # Counted until the response starts, queries of a streamed body are not included
+        return [
+            (b"x-db-query-count", str(request.db_queries).encode()),
+            (b"x-db-time-ms", f"{request.db_seconds * 1000:.1f}".encode()),
+        ]
+
+    def finish_request(self, request: RequestContext) -> None:
+        if not self.repeated_threshold:
+            return
+        repeated = [(statement, count) for statement, count in request.db_statements.items() if count >= self.repeated_threshold]
+        if not repeated:
+            return
+
+        for statement, count in repeated:
+            app_logger.warning(
+                f"Possible N+1: {count} x same statement in {request.method} {request.route} "
+                f"request_id={request.request_id} sql={statement[:STATEMENT_LOG_LENGTH]}"
+            )
+        with self._lock:
+            self._stats["repeated_statement_requests"] += 1
+            self._repeated.append(
+                {
+                    "at": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "route": f"{request.method} {request.route}",
+                    "request_id": request.request_id,
+                    "queries": request.db_queries,
+                    "statements": [{"count": count, "statement": statement[:STATEMENT_LOG_LENGTH]} for statement, count in repeated],
+                }
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["recent_slow_queries"] = list(self._slow)
+            stats["recent_repeated_statements"] = list(self._repeated)
+        stats["slow_query_ms"] = self.slow_query_seconds * 1000
+        stats["repeated_threshold"] = self.repeated_threshold
+        return stats
@@ -0,0 +1,35 @@
+import time
+from typing import Callable
+
+from sqlalchemy import event, Engine
+
+# (engine name, statement, parameters, executemany, elapsed seconds)
+QueryObserver = Callable[[str, str, object, bool, float], None]
+START_KEY = "query_timing_start"
+
+
+def time_queries(engine: Engine, name: str, observers: list[QueryObserver]) -> None:
+    """Times every statement of ``engine`` once and passes the result to ``observers``.
+
+    The start time is kept on the connection (a connection runs one statement at a time) and removed in
+    ``handle_error`` as well, so failed statements leave nothing behind on pooled connections.
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info[START_KEY] = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.pop(START_KEY, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        for observer in observers:
+            observer(name, statement, parameters, executemany, elapsed)
+
+    def handle_error(context) -> None:
+        if context.connection is not None:
+            context.connection.info.pop(START_KEY, None)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -7,7 +7,7 @@ class UserModel(BaseModel):
     first_name: str
     last_name: str
     email: EmailStr | None
-    role_id: int | None
+    role_id: int | None = None
 
     @computed_field
     @property
@@ -0,0 +1,20 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy import LargeBinary, BigInteger, Integer, Boolean, Text
+
+# Dialect-portable column types: the MySQL schema is unchanged, other databases (SQLite for local and
+# load testing) get the closest generic type.
+
+# BIGINT UNSIGNED on MySQL; INTEGER on SQLite, where only "INTEGER PRIMARY KEY" autoincrements
+UnsignedBigInteger = BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql").with_variant(Integer(), "sqlite")
+
+# LONGTEXT on MySQL
+LongText = Text().with_variant(mysql.LONGTEXT(), "mysql")
+
+# MEDIUMBLOB on MySQL (up to 16 MB)
+MediumBlob = LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql")
+
+# TEXT on MySQL
+PlainText = Text().with_variant(mysql.TEXT(), "mysql")
+
+# BOOL on MySQL
+Bool = Boolean().with_variant(mysql.BOOLEAN(), "mysql")
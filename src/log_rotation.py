@@ -0,0 +1,220 @@
+import threading
+import datetime
+import logging
+import shutil
+import queue
+import time
+import gzip
+import re
+import os
+from logging.handlers import BaseRotatingHandler
+
+# Child of the app logger, so problems show up in app.log and on the console
+logger = logging.getLogger("roechling_office_api.log_rotation")
+
+ROTATE_MIDNIGHT = "midnight"
+ROTATE_HOURLY = "hourly"
+ROTATE_NEVER = "never"
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+
+def _next_rollover(when: str, now: float) -> float:
+    current = datetime.datetime.fromtimestamp(now)
+    if when == ROTATE_MIDNIGHT:
+        return (current.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)).timestamp()
+    if when == ROTATE_HOURLY:
+        return (current.replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)).timestamp()
+    return float("inf")
+
+
+class LogCompressor:
+    """Compresses rotated log segments in a background thread and keeps them within ``retention_bytes``.
+
+    Segments are matched by name (``app.20250131-235959.log[.gz]``, including the ``app.log.20250131.log``
+    backups of the former ``TimedRotatingFileHandler``); when they take more than ``retention_bytes`` together,
+    the oldest ones are deleted. Segments left uncompressed by a previous run are picked up on start.
+    """
+
+    def __init__(self, compression: str, retention_bytes: int, level: int = 6):
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning("zstandard is not installed, rotated logs are compressed with gzip")
+                compression = "gzip"
+        self.compression = compression if compression in COMPRESSION_EXTENSIONS else "gzip"
+        self.extension = COMPRESSION_EXTENSIONS[self.compression]
+        self.retention_bytes = retention_bytes
+        self.level = level
+        self._patterns: dict[str, re.Pattern] = {}
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stats = {"compressed": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0, "deleted": 0, "bytes_deleted": 0}
+
+    def register(self, base_filename: str) -> None:
+        # Rotated segments of base_filename: <stem>.<date>[-<time>[-n]]<ext>[.gz|.zst], and the backups of the
+        # former TimedRotatingFileHandler, which appended the date and a second extension: <name>.<date>.log
+        directory, name = os.path.split(base_filename)
+        stem, ext = os.path.splitext(name)
+        suffix = r"(?:\.gz|\.zst)?$"
+        rotated = rf"{re.escape(stem)}\.\d{{8}}(?:-\d{{6}}(?:-\d+)?)?{re.escape(ext)}"
+        legacy = rf"{re.escape(name)}\.\d{{8}}\.log"
+        self._patterns[os.path.abspath(base_filename)] = re.compile(rf"^(?:{rotated}|{legacy}){suffix}")
+
+    def segments(self) -> list[os.DirEntry]:
+        segments = []
+        for directory in {os.path.dirname(path) for path in self._patterns}:
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.is_file() and any(pattern.match(entry.name) for pattern in self._patterns.values()):
+                    segments.append(entry)
+        return segments
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="log-compressor", daemon=True)
+        self._thread.start()
+        if self.extension:
+            for entry in self.segments():
+                if not entry.name.endswith((".gz", ".zst")):
+                    self._queue.put(entry.path)
+        self._queue.put("")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        # Unfinished segments stay uncompressed and are compressed after the next start
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, path: str) -> None:
+        self._queue.put(path)
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            try:
+                if path and self.extension:
+                    self._compress(path)
+                self._enforce_retention()
+            except Exception as e:
+                # Any failure only costs this segment, the thread keeps serving the queue
+                with self._lock:
+                    self._stats["failed"] += 1
+                logger.warning(f"Log segment {path} not compressed: {e!r}")
+
+    def _open(self, path: str):
+        if self.compression == "zstd":
+            import zstandard
+
+            return zstandard.open(path, "wb", cctx=zstandard.ZstdCompressor(level=self.level))
+        return gzip.open(path, "wb", compresslevel=self.level)
+
+    def _compress(self, path: str) -> None:
+        if not os.path.isfile(path):
+            return
+        target = path + self.extension
+        partial = target + ".part"
+        with open(path, "rb") as source, self._open(partial) as destination:
+            shutil.copyfileobj(source, destination, 1024 * 1024)
+        before, after = os.path.getsize(path), os.path.getsize(partial)
+        # Keep the modification time, retention deletes by age
+        os.utime(partial, (time.time(), os.path.getmtime(path)))
+        os.replace(partial, target)
+        os.remove(path)
+        with self._lock:
+            self._stats["compressed"] += 1
+            self._stats["bytes_before"] += before
+            self._stats["bytes_after"] += after
+
+    def _enforce_retention(self) -> None:
+        if self.retention_bytes <= 0:
+            return
+        segments = sorted(self.segments(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in segments)
+        for entry in segments:
+            if total <= self.retention_bytes:
+                break
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            total -= size
+            with self._lock:
+                self._stats["deleted"] += 1
+                self._stats["bytes_deleted"] += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        segments = self.segments()
+        stats["segments"] = len(segments)
+        stats["segments_bytes"] = sum(entry.stat().st_size for entry in segments)
+        stats["pending"] = self._queue.qsize()
+        stats["compression"] = self.compression
+        stats["retention_bytes"] = self.retention_bytes
+        return stats
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """File handler rotating at ``max_bytes`` and at midnight or every hour, whichever comes first.
+
+    The active file is renamed to ``<stem>.<YYYYmmdd-HHMMSS><ext>`` (time of the rotation) on the writer thread,
+    compression and retention run in the ``LogCompressor`` thread.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, when: str, compressor: LogCompressor, encoding: str = "utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=False)
+        self.max_bytes = max_bytes
+        self.when = when
+        self.compressor = compressor
+        self._pid = os.getpid()
+        compressor.register(self.baseFilename)
+        # A file left from a previous run is rotated with the first record once its interval is over
+        started = os.path.getmtime(self.baseFilename) if os.path.getsize(self.baseFilename) else time.time()
+        self.rollover_at = _next_rollover(when, started)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if os.getpid() != self._pid:
+            # Forked render workers append to the file but leave rotating to the API process
+            self._reopen_if_rotated()
+            return False
+        if time.time() >= self.rollover_at:
+            return True
+        return 0 < self.max_bytes <= self.stream.tell()
+
+    def _reopen_if_rotated(self) -> None:
+        # As WatchedFileHandler: the inherited descriptor still points to the renamed segment after a rotation
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self.stream.fileno())
+        if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            self.stream.close()
+            self.stream = self._open()
+
+    def _rotated_filename(self) -> str:
+        stem, ext = os.path.splitext(self.baseFilename)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        rotated, counter = f"{stem}.{timestamp}{ext}", 1
+        while any(os.path.exists(rotated + suffix) for suffix in ("", ".gz", ".zst")):
+            rotated, counter = f"{stem}.{timestamp}-{counter}{ext}", counter + 1
+        return rotated
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            rotated = self._rotated_filename()
+            os.rename(self.baseFilename, rotated)
+            self.compressor.submit(rotated)
+        self.stream = self._open()
+        self.rollover_at = _next_rollover(self.when, time.time())
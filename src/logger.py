@@ -1,13 +1,25 @@
+import datetime
 import logging
-import os
+import atexit
+import queue
+import json
+import copy
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import os
+from logging.handlers import QueueListener, QueueHandler
 
+from src.monitoring.context import current_request
+from src.log_rotation import CompressingRotatingFileHandler, LogCompressor
 from src.config import config
 
 # Ensure logs directory exists before any handler tries to open a file
 os.makedirs(config.LOGS_PATH, exist_ok=True)
 
+APP_LOGGER_NAME = "roechling_office_api"
+# Attributes of every LogRecord, everything else passed with extra= is written to the JSON lines as well
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_CONTEXT_ATTRIBUTES = ("request_id", "method", "route", "elapsed_ms")
+
 # Formatters
 CONSOLE_FORMATTER = logging.Formatter(
     fmt="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
@@ -18,28 +30,167 @@ FILE_FORMATTER = logging.Formatter(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-# --- Root logger → global.log (catches all loggers including third-party) ---
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request id, route and latency of the request that logged it."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "location": f"{record.filename}:{record.lineno}",
+            "function": record.funcName,
+            "thread": record.threadName,
+        }
+        for name in _CONTEXT_ATTRIBUTES:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and name not in entry and name not in _CONTEXT_ATTRIBUTES:
+                entry[name] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Puts records into a bounded queue without ever blocking the caller.
+
+    The message and traceback are rendered on the calling thread (arguments may change later) and the current
+    ``RequestContext`` is attached. Records which do not fit into the queue are dropped and counted; the
+    number of dropped records is logged as soon as the queue has room again. Counters are guarded by the
+    handler's own (reentrant) lock, which logging re-creates in forked processes.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._stats = {"queued": 0, "dropped": 0}
+        self._dropped_by_level: dict[str, int] = {}
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = FILE_FORMATTER.formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+
+        context = current_request()
+        if context is not None:
+            record.request_id = context.request_id
+            record.method = context.method
+            record.route = context.route
+            record.elapsed_ms = round(context.elapsed * 1000, 1)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.lock:
+                self._stats["dropped"] += 1
+                self._dropped_by_level[record.levelname] = self._dropped_by_level.get(record.levelname, 0) + 1
+                self._unreported += 1
+            return
+
+        with self.lock:
+            self._stats["queued"] += 1
+            unreported, self._unreported = self._unreported, 0
+        if unreported:
+            notice = logging.LogRecord(
+                APP_LOGGER_NAME, logging.WARNING, __file__, 0, f"Logging queue full, {unreported} records dropped", None, None
+            )
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                with self.lock:
+                    self._unreported += unreported
+
+    def stats(self) -> dict:
+        with self.lock:
+            stats = dict(self._stats)
+            stats["dropped_by_level"] = dict(self._dropped_by_level)
+        stats["pending"] = self.queue.qsize()
+        stats["max_size"] = self.queue.maxsize
+        return stats
+
+
+class LogListener(QueueListener):
+    """``QueueListener`` writing in one background thread; stopping waits until the queue is drained."""
+
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown, wait for the writer instead of failing
+        self.queue.put(self._sentinel)
+
+
+def _restart_after_fork() -> None:
+    # Forked render workers inherit the handlers but not the writer thread, they get their own queue and thread
+    global log_listener
+    log_queue_handler.queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    log_listener = LogListener(log_queue_handler.queue, *log_listener.handlers, respect_handler_level=True)
+    log_queue_handler.listener = log_listener
+    log_listener.start()
+
+
+def _app_only(handler: logging.Handler) -> logging.Handler:
+    # All records arrive through one queue, app handlers only take the records of the app logger
+    handler.addFilter(logging.Filter(APP_LOGGER_NAME))
+    return handler
+
+
+# --- Root logger → queue → global.log (catches all loggers including third-party) ---
+# --- App logger → (propagates to root) → app.YYYYMMDD.log + console ---
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
-if not root_logger.handlers:
-    global_handler = logging.FileHandler(config.GLOBAL_LOG_PATH, encoding="utf-8")
-    global_handler.setFormatter(FILE_FORMATTER)
-    root_logger.addHandler(global_handler)
-
-# --- App logger → app.YYYYMMDD.log + console ---
-app_logger = logging.getLogger("roechling_office_api")
+app_logger = logging.getLogger(APP_LOGGER_NAME)
 app_logger.setLevel(logging.INFO)
 
-if not app_logger.handlers:
-    # Rotating file handler: daily rotation, 5 backups, pattern: app.20250131.log
-    file_handler = TimedRotatingFileHandler(
-        config.APP_LOG_PATH, when="midnight", interval=1, backupCount=5, encoding="utf-8"
+if not any(isinstance(handler, BoundedQueueHandler) for handler in root_logger.handlers):
+    file_formatter = JsonFormatter() if config.LOG_FORMAT == "json" else FILE_FORMATTER
+
+    # Rotation by size and time, pattern: app.20250131-235959.log.gz, compressed and pruned in the background
+    log_compressor = LogCompressor(compression=config.LOG_COMPRESSION, retention_bytes=config.LOG_RETENTION_BYTES)
+
+    global_handler = CompressingRotatingFileHandler(
+        config.GLOBAL_LOG_PATH, max_bytes=config.LOG_MAX_BYTES, when=config.LOG_ROTATE_WHEN, compressor=log_compressor
     )
-    file_handler.suffix = "%Y%m%d.log"
-    file_handler.setFormatter(FILE_FORMATTER)
-    app_logger.addHandler(file_handler)
+    global_handler.setFormatter(file_formatter)
+
+    file_handler = CompressingRotatingFileHandler(
+        config.APP_LOG_PATH, max_bytes=config.LOG_MAX_BYTES, when=config.LOG_ROTATE_WHEN, compressor=log_compressor
+    )
+    file_handler.setFormatter(file_formatter)
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(CONSOLE_FORMATTER)
-    app_logger.addHandler(console_handler)
+
+    # Request code only enqueues, file and console I/O happens in the listener thread
+    log_queue_handler = BoundedQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+    log_listener = LogListener(
+        log_queue_handler.queue,
+        global_handler,
+        _app_only(file_handler),
+        _app_only(console_handler),
+        respect_handler_level=True,
+    )
+    log_queue_handler.listener = log_listener
+    root_logger.addHandler(log_queue_handler)
+    log_listener.start()
+    log_compressor.start()
+    atexit.register(log_compressor.stop)
+    # Registered last, runs first: records still in the queue may trigger one more rotation
+    atexit.register(lambda: log_listener.stop())
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_after_fork)
+else:
+    log_queue_handler = next(handler for handler in root_logger.handlers if isinstance(handler, BoundedQueueHandler))
+    log_listener = log_queue_handler.listener
+    log_compressor = next(handler.compressor for handler in log_listener.handlers if isinstance(handler, CompressingRotatingFileHandler))
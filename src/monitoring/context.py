@@ -0,0 +1,128 @@
+import contextvars
+import collections
+import threading
+import uuid
+import time
+import re
+from dataclasses import dataclass, field
+
+from starlette.routing import compile_path
+
+UNMATCHED_ROUTE = "unmatched"
+REQUEST_ID_HEADER = "x-request-id"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+@dataclass
+class RequestContext:
+    """Per-request state shared by the monitoring hooks (SQL statistics, logging)."""
+
+    request_id: str
+    method: str
+    path: str
+    route: str
+    started: float = field(default_factory=time.perf_counter)
+    status_code: int | None = None
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    # Normalized statement -> executions, used to spot N+1 query patterns
+    db_statements: collections.Counter = field(default_factory=collections.Counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+request_context: contextvars.ContextVar[RequestContext | None] = contextvars.ContextVar("request_context", default=None)
+
+
+def current_request() -> RequestContext | None:
+    return request_context.get()
+
+
+class RouteResolver:
+    """Maps a request to its route template (``/v1/guest-book/download-form/{guest_book_id}``), so metric
+    labels stay bounded. Templates are taken from the application routes on first use, including the ones
+    hidden from the schema such as ``/metrics``."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: list[tuple[re.Pattern, set[str], str]] | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _walk(cls, routes, prefix: str = ""):
+        for route in routes:
+            included = getattr(route, "original_router", None)
+            if included is not None:
+                # Newer FastAPI versions keep included routers as nodes instead of copying their routes
+                yield from cls._walk(included.routes, prefix + route.include_context.prefix)
+            elif getattr(route, "methods", None) and getattr(route, "path", None) is not None:
+                # HTTP routes only, mounts and websocket routes have no methods
+                yield prefix + route.path, route.methods
+
+    def _build(self) -> list[tuple[re.Pattern, set[str], str]]:
+        return [(compile_path(path)[0], set(methods), path) for path, methods in self._walk(self.app.routes)]
+
+    def resolve(self, method: str, path: str) -> str:
+        if self._routes is None:
+            with self._lock:
+                if self._routes is None:
+                    self._routes = self._build()
+        for pattern, methods, template in self._routes:
+            if method in methods and pattern.match(path):
+                return template
+        return UNMATCHED_ROUTE
+
+
+class RequestContextMiddleware:
+    """Outermost ASGI middleware: assigns the request id (``X-Request-ID`` from the client or a new one),
+    resolves the route template and keeps a ``RequestContext`` in a context variable for the request.
+
+    ``response_hooks`` are called with the context when the response starts and return extra headers,
+    ``finish_hooks`` are called once the request is done.
+    """
+
+    def __init__(self, app, routes_app, response_hooks: list | None = None, finish_hooks: list | None = None):
+        self.app = app
+        self.resolver = RouteResolver(routes_app)
+        self.response_hooks = response_hooks or []
+        self.finish_hooks = finish_hooks or []
+
+    @staticmethod
+    def _request_id(scope) -> str:
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")
+                if REQUEST_ID_PATTERN.match(request_id):
+                    return request_id
+                break
+        return uuid.uuid4().hex
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        context = RequestContext(
+            request_id=self._request_id(scope),
+            method=scope["method"],
+            path=scope["path"],
+            route=self.resolver.resolve(scope["method"], scope["path"]),
+        )
+        token = request_context.set(context)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                context.status_code = message["status"]
+                headers = [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), context.request_id.encode())]
+                for hook in self.response_hooks:
+                    headers.extend(hook(context))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            for hook in self.finish_hooks:
+                hook(context)
+            request_context.reset(token)
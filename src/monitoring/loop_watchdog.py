@@ -0,0 +1,130 @@
+import collections
+import traceback
+import threading
+import datetime
+import asyncio
+import time
+import sys
+
+from src.logger import app_logger
+from src.config import config
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class LoopWatchdog:
+    """Measures event loop lag and captures the stack of code blocking the loop.
+
+    A task on the loop sleeps ``interval`` seconds and records how late it woke up. A monitor thread watches
+    the task's heartbeat; when the loop has not ticked for longer than ``threshold``, it dumps the current
+    stack of the loop thread (i.e. the blocking code, while it is still blocking) into ``stall_log_path``.
+    """
+
+    def __init__(self, interval: float, threshold: float, stall_log_path: str, max_samples: int = 3000):
+        self.interval = interval
+        self.threshold = threshold
+        self.stall_log_path = stall_log_path
+        self._samples: collections.deque[float] = collections.deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._beat = 0
+        self._captured_beat = -1
+        self._stalls = 0
+        self._last_stall: dict | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        app_logger.info(f"Event loop watchdog started (interval {self.interval * 1000:.0f} ms, threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=self.interval * 2)
+        self._thread = None
+
+    async def _tick(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                self._samples.append(max(now - expected, 0.0))
+                self._heartbeat = now
+                self._beat += 1
+
+    def _monitor(self) -> None:
+        check_every = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(check_every):
+            with self._lock:
+                blocked_for = time.monotonic() - self._heartbeat - self.interval
+                beat = self._beat
+            # One capture per stall, the heartbeat does not move while the loop is blocked
+            if blocked_for > self.threshold and self._captured_beat != beat:
+                self._captured_beat = beat
+                self._capture(blocked_for)
+
+    def _capture(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<loop thread not found>\n"
+        captured_at = datetime.datetime.now()
+        with self._lock:
+            self._stalls += 1
+            self._last_stall = {"captured_at": captured_at.isoformat(), "blocked_ms": round(blocked_for * 1000, 1)}
+        try:
+            with open(self.stall_log_path, "a", encoding="utf-8") as f:
+                f.write(f"=== {captured_at:%Y-%m-%d %H:%M:%S} | event loop blocked for {blocked_for * 1000:.0f} ms so far ===\n{stack}\n")
+        except OSError as e:
+            app_logger.error(f"Could not write event loop stall stack: {e}")
+        app_logger.warning(f"Event loop blocked for {blocked_for * 1000:.0f} ms, stack written to {self.stall_log_path}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            stalls = self._stalls
+            last_stall = self._last_stall
+        return {
+            "enabled": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(samples),
+            "lag_p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+            "lag_p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+            "lag_p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+            "lag_max_ms": round(samples[-1] * 1000, 3) if samples else 0.0,
+            "stalls": stalls,
+            "last_stall": last_stall,
+        }
+
+
+loop_watchdog = LoopWatchdog(
+    interval=config.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+    threshold=config.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+    stall_log_path=config.LOOP_STALL_LOG_PATH,
+)
@@ -0,0 +1,185 @@
+import time
+import re
+from typing import Callable
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client import (
+    disable_created_metrics,
+    generate_latest,
+    PlatformCollector,
+    CollectorRegistry,
+    ProcessCollector,
+    GCCollector,
+    Histogram,
+    Counter,
+    Gauge,
+    CONTENT_TYPE_LATEST,
+)
+
+from src.monitoring.context import current_request, RouteResolver
+
+# No "_created" series, they double the exported series without being used by our alerts
+disable_created_metrics()
+
+# Own registry, so only the metrics below (and the process collectors) are exported
+registry = CollectorRegistry()
+ProcessCollector(registry=registry)
+PlatformCollector(registry=registry)
+GCCollector(registry=registry)
+
+SQL_OPERATION_PATTERN = re.compile(r"^\s*(\w+)")
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["method", "route", "status"],
+    registry=registry,
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route, including streaming of the response body",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    registry=registry,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled by route",
+    ["method", "route"],
+    registry=registry,
+)
+pdf_render_duration_seconds = Histogram(
+    "pdf_render_duration_seconds",
+    "Time spent in generate_form inside a render worker",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+    registry=registry,
+)
+pdf_render_wait_seconds = Histogram(
+    "pdf_render_wait_seconds",
+    "Time a render job waited in the render pool queue",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    registry=registry,
+)
+pdf_render_size_bytes = Histogram(
+    "pdf_render_size_bytes",
+    "Size of the rendered guest book PDFs",
+    buckets=(16_384, 65_536, 131_072, 262_144, 524_288, 1_048_576, 2_097_152, 4_194_304, 8_388_608, 16_777_216),
+    registry=registry,
+)
+db_queries_total = Counter(
+    "db_queries_total",
+    "SQL statements executed by engine and operation",
+    ["engine", "operation"],
+    registry=registry,
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time by engine and operation",
+    ["engine", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    registry=registry,
+)
+
+
+def observe_render(render_seconds: float, wait_seconds: float, size: int) -> None:
+    pdf_render_duration_seconds.observe(render_seconds)
+    pdf_render_wait_seconds.observe(max(wait_seconds, 0.0))
+    pdf_render_size_bytes.observe(size)
+
+
+def sql_operation(statement: str) -> str:
+    match = SQL_OPERATION_PATTERN.match(statement)
+    operation = match.group(1).upper() if match else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def observe_query(engine_name: str, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    # Observer of src.database.query_timing
+    operation = sql_operation(statement)
+    db_queries_total.labels(engine_name, operation).inc()
+    db_query_duration_seconds.labels(engine_name, operation).observe(elapsed)
+
+
+class StatsCollector:
+    """Exports values of existing ``stats()`` dictionaries at scrape time.
+
+    ``sources`` maps a label value to a stats function, keys of nested dictionaries are addressed with dots
+    (``pool.checked_out``). Metric names are ``<prefix>_<key>`` with dots replaced by underscores.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        sources: dict[str, Callable[[], dict]],
+        gauges: dict[str, str] | None = None,
+        counters: dict[str, str] | None = None,
+        label: str | None = None,
+    ):
+        self.prefix = prefix
+        self.sources = sources
+        self.gauges = gauges or {}
+        self.counters = counters or {}
+        self.label = label
+
+    @staticmethod
+    def _value(stats: dict, key: str) -> float | None:
+        value = stats
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return None
+            value = value[part]
+        return float(value) if isinstance(value, (int, float)) else None
+
+    def collect(self):
+        snapshots = {name: stats_fn() for name, stats_fn in self.sources.items()}
+        labels = [self.label] if self.label else []
+        for keys, family_class in ((self.gauges, GaugeMetricFamily), (self.counters, CounterMetricFamily)):
+            for key, documentation in keys.items():
+                family = family_class(f"{self.prefix}_{key.replace('.', '_')}", documentation, labels=labels)
+                for name, stats in snapshots.items():
+                    value = self._value(stats, key)
+                    if value is not None:
+                        family.add_metric([name] if self.label else [], value)
+                yield family
+
+
+def register_stats(*args, **kwargs) -> None:
+    registry.register(StatsCollector(*args, **kwargs))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes and in-flight requests per route."""
+
+    def __init__(self, app, routes_app):
+        self.app = app
+        self.resolver = RouteResolver(routes_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        context = current_request()
+        route = context.route if context is not None else self.resolver.resolve(method, scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            http_request_duration_seconds.labels(method, route).observe(time.perf_counter() - started)
+            http_requests_total.labels(method, route, str(status_code)).inc()
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(registry), CONTENT_TYPE_LATEST
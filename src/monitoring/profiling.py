@@ -0,0 +1,251 @@
+import collections
+import threading
+import itertools
+import datetime
+import cProfile
+import pstats
+import time
+import sys
+import re
+import os
+import io
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+from fastapi import HTTPException
+
+from src.monitoring.context import current_request, RouteResolver
+from src.logger import app_logger
+from src.config import config
+from src.auth import verify_token
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_MODE_CPROFILE = "cprofile"
+PROFILE_MODE_SAMPLE = "sample"
+PROFILE_MODES = {PROFILE_MODE_CPROFILE, PROFILE_MODE_SAMPLE}
+PROFILE_FLAG_VALUES = {"1", "true", "yes"}
+# Tells the client why a requested profile was not taken
+PROFILE_STATUS_HEADER = b"x-profile-status"
+PROFILE_STATUS_DISABLED = b"disabled"
+PROFILE_STATUS_BUSY = b"busy"
+
+
+def collapse_stack(frame) -> str:
+    # Root first, separated by ";" as expected by flamegraph.pl and speedscope
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _with_headers(send, *headers: tuple[bytes, bytes]):
+    async def send_wrapper(message):
+        if message["type"] == "http.response.start":
+            message["headers"] = [*message.get("headers", []), *headers]
+        await send(message)
+
+    return send_wrapper
+
+
+class StackSampler:
+    """Samples the stacks of all threads of the process every ``interval`` seconds from a background thread.
+
+    Each stack starts with the name of its thread, so the event loop, the threadpool running sync endpoints
+    and ``run_in_threadpool`` calls and the background threads can be told apart. Idle threads show up
+    waiting in ``wait``/``get``. The render worker processes are not sampled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    self.samples[f"{names.get(thread_id, thread_id)};{collapse_stack(frame)}"] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class RequestProfiler:
+    """Profiles single requests on demand and saves the results under ``output_path``.
+
+    An admin asks for a profile with the ``X-Profile`` header or the ``profile`` query parameter (``cprofile``,
+    ``sample`` or ``1``); besides that every ``sample_every``-th request is profiled with ``sample_mode``.
+    The sampler sees every thread of the API process; ``cProfile`` only instruments the event loop thread (work
+    handed to the threadpool appears as the awaiting call). Concurrent requests show up in both profiles.
+
+    Output per profile: ``.collapsed`` stack samples (flamegraph compatible) and a ``.txt`` report; the
+    ``cprofile`` mode also writes the call tree as ``.txt`` and the raw ``.prof`` for snakeviz/pstats.
+    """
+
+    def __init__(self, output_path: str, sample_every: int, sample_mode: str, sample_interval: float, max_files: int):
+        self.output_path = output_path
+        self.sample_every = max(sample_every, 0)
+        self.sample_mode = sample_mode if sample_mode in PROFILE_MODES else PROFILE_MODE_SAMPLE
+        self.sample_interval = sample_interval
+        self.max_files = max_files
+        self._counter = itertools.count(1)
+        # One profile at a time, profilers of overlapping requests would see each other's frames
+        self._busy = threading.Lock()
+
+    @staticmethod
+    def requested_mode(scope) -> str | None:
+        value = None
+        for name, header_value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                value = header_value.decode("latin-1")
+                break
+        if value is None and scope.get("query_string"):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_QUERY_PARAM)
+            value = values[0] if values else None
+        if value is None:
+            return None
+        value = value.strip().lower()
+        if value in PROFILE_MODES:
+            return value
+        return PROFILE_MODE_CPROFILE if value in PROFILE_FLAG_VALUES else None
+
+    @staticmethod
+    def _is_admin(scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return False
+                try:
+                    return verify_token(token).is_admin
+                except HTTPException:
+                    return False
+        return False
+
+    def select_mode(self, scope) -> str | None:
+        mode = self.requested_mode(scope)
+        if mode is not None:
+            # Requests from other users run normally, the flag is ignored
+            return mode if self._is_admin(scope) else None
+        if self.sample_every and next(self._counter) % self.sample_every == 0:
+            return self.sample_mode
+        return None
+
+    def acquire(self) -> bool:
+        return self._busy.acquire(blocking=False)
+
+    def release(self) -> None:
+        self._busy.release()
+
+    def profile_id(self, method: str, route: str) -> str:
+        slug = re.sub(r"[^a-zA-Z0-9]+", "-", route).strip("-") or "root"
+        return f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{method.lower()}_{slug}"
+
+    def save(self, profile_id: str, mode: str, elapsed: float, samples: collections.Counter, profiler: cProfile.Profile | None) -> None:
+        os.makedirs(self.output_path, exist_ok=True)
+        base = os.path.join(self.output_path, profile_id)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        report = io.StringIO()
+        report.write(f"{profile_id} mode={mode} elapsed={elapsed * 1000:.1f} ms samples={sum(samples.values())}\n\n")
+        if profiler is not None:
+            profiler.dump_stats(f"{base}.prof")
+            stats = pstats.Stats(profiler, stream=report).sort_stats(pstats.SortKey.CUMULATIVE)
+            stats.print_stats(60)
+            stats.print_callees(30)
+        else:
+            report.write("Hottest stacks:\n")
+            for stack, count in samples.most_common(30):
+                report.write(f"{count:6d}  {' <- '.join(reversed(stack.split(';')[-3:]))}\n")
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        self._prune()
+        app_logger.info(f"Request profile saved to {base}.txt ({mode}, {elapsed * 1000:.1f} ms)")
+
+    def _prune(self) -> None:
+        if self.max_files <= 0:
+            return
+        files = sorted((entry for entry in os.scandir(self.output_path) if entry.is_file()), key=lambda entry: entry.stat().st_mtime)
+        for entry in files[: max(len(files) - self.max_files, 0)]:
+            os.remove(entry.path)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware running selected requests under ``RequestProfiler``; only installed when
+    ``PROFILING_ENABLED`` is set, so normal deployments pay nothing for it."""
+
+    def __init__(self, app, routes_app, profiler: RequestProfiler):
+        self.app = app
+        self.resolver = RouteResolver(routes_app)
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        mode = self.profiler.select_mode(scope)
+        if mode is None:
+            return await self.app(scope, receive, send)
+        if not self.profiler.acquire():
+            return await self.app(scope, receive, _with_headers(send, (PROFILE_STATUS_HEADER, PROFILE_STATUS_BUSY)))
+
+        try:
+            context = current_request()
+            route = context.route if context is not None else self.resolver.resolve(scope["method"], scope["path"])
+            profile_id = self.profiler.profile_id(scope["method"], route)
+
+            send_wrapper = _with_headers(send, (b"x-profile-id", profile_id.encode()))
+            sampler = StackSampler(self.profiler.sample_interval)
+            profiler = cProfile.Profile() if mode == PROFILE_MODE_CPROFILE else None
+            started = time.perf_counter()
+            sampler.start()
+            if profiler is not None:
+                profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                sampler.stop()
+                elapsed = time.perf_counter() - started
+                # Written after the response, off the event loop
+                try:
+                    await run_in_threadpool(self.profiler.save, profile_id, mode, elapsed, sampler.samples, profiler)
+                except OSError as e:
+                    app_logger.warning(f"Request profile {profile_id} not saved: {e!r}")
+        finally:
+            self.profiler.release()
+
+
+class ProfilingDisabledMiddleware:
+    """Installed instead of ``ProfilingMiddleware`` while ``PROFILING_ENABLED`` is off: a request asking for a
+    profile runs normally and its response carries ``X-Profile-Status: disabled``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and RequestProfiler.requested_mode(scope) is not None:
+            send = _with_headers(send, (PROFILE_STATUS_HEADER, PROFILE_STATUS_DISABLED))
+        return await self.app(scope, receive, send)
+
+
+request_profiler = RequestProfiler(
+    output_path=config.PROFILES_PATH,
+    sample_every=config.PROFILING_SAMPLE_EVERY,
+    sample_mode=config.PROFILING_SAMPLE_MODE,
+    sample_interval=config.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+    max_files=config.PROFILING_MAX_FILES,
+)
@@ -0,0 +1,18 @@
+from fastapi.responses import Response
+from fastapi import status, APIRouter
+
+from src.monitoring.metrics import render_latest
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    name="Metrics",
+    include_in_schema=False,
+)
+def get_metrics() -> Response:
+    # Prometheus text exposition format
+    content, media_type = render_latest()
+    return Response(content=content, media_type=media_type)
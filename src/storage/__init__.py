@@ -0,0 +1,130 @@
+import threading
+import tempfile
+import hashlib
+import re
+import os
+from dataclasses import dataclass
+from typing import Callable, BinaryIO
+from abc import abstractmethod, ABC
+
+from src.config import config
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    sha256: str
+    size: int
+    backend: str
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for binary files, blobs are identified by their SHA-256 hex digest."""
+
+    name: str
+
+    @abstractmethod
+    def put(self, data: bytes) -> StoredBlob: ...
+
+    @abstractmethod
+    def open(self, sha256: str) -> BinaryIO: ...
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool: ...
+
+    @abstractmethod
+    def delete(self, sha256: str) -> None: ...
+
+    def local_path(self, sha256: str) -> str | None:
+        # Backends on the local filesystem return a path so the file can be served with sendfile
+        return None
+
+    def read(self, sha256: str) -> bytes:
+        with self.open(sha256) as f:
+            return f.read()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def validate_digest(sha256: str) -> str:
+        if not SHA256_PATTERN.match(sha256 or ""):
+            raise ValueError(f"Invalid SHA-256 digest '{sha256}'")
+        return sha256
+
+
+class LocalBlobStore(BlobStore):
+    """Stores blobs under ``root/ab/cd/<sha256>``; identical content is stored only once."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, sha256: str) -> str:
+        sha256 = self.validate_digest(sha256)
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def put(self, data: bytes) -> StoredBlob:
+        sha256 = self.digest(data)
+        path = self._path(sha256)
+        if not os.path.isfile(path):
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return StoredBlob(sha256=sha256, size=len(data), backend=self.name)
+
+    def open(self, sha256: str) -> BinaryIO:
+        return open(self._path(sha256), "rb")
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.isfile(self._path(sha256))
+
+    def delete(self, sha256: str) -> None:
+        path = self._path(sha256)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def local_path(self, sha256: str) -> str | None:
+        return self._path(sha256)
+
+
+# Registered backends, new backends can be added with register_blob_store()
+_factories: dict[str, Callable[[], BlobStore]] = {
+    LocalBlobStore.name: lambda: LocalBlobStore(config.BLOB_STORE_PATH),
+}
+_instances: dict[str, BlobStore] = {}
+_lock = threading.Lock()
+
+
+def register_blob_store(name: str, factory: Callable[[], BlobStore]) -> None:
+    with _lock:
+        _factories[name] = factory
+        _instances.pop(name, None)
+
+
+def get_blob_store(name: str | None = None) -> BlobStore:
+    name = name or config.BLOB_STORE_BACKEND
+    store = _instances.get(name)
+    if store is None:
+        with _lock:
+            store = _instances.get(name)
+            if store is None:
+                if name not in _factories:
+                    raise ValueError(f"Unknown blob store backend '{name}'")
+                store = _instances[name] = _factories[name]()
+    return store
@@ -0,0 +1,146 @@
+from fastapi import status, APIRouter
+
+from src.v1.guest_book.materializer import render_materializer
+from src.monitoring.loop_watchdog import loop_watchdog
+from src.v1.guest_book.signature import signature_processor
+from src.v1.guest_book.renderer import render_pool
+from src.auth.last_login import last_login_buffer
+from src.v1.forms.cache import form_cache
+from src.database import sync_pool_metrics, pool_metrics, query_stats
+from src.logger import log_queue_handler, log_compressor
+from src.auth import password_hasher, token_cache
+
+router = APIRouter()
+
+
+@router.get(
+    "/template-stats",
+    status_code=status.HTTP_200_OK,
+    name="Template Stats",
+    response_model=dict,
+)
+def get_template_stats() -> dict:
+    # Return compile and render timings of the guest book templates, summed over the render workers
+    return render_pool.worker_stats()["templates"]
+
+
+@router.get(
+    "/render-stats",
+    status_code=status.HTTP_200_OK,
+    name="Render Stats",
+    response_model=dict,
+)
+def get_render_stats() -> dict:
+    # Return PDF render pool, form layer cache (render workers) and background rendering counters
+    worker_stats = render_pool.worker_stats()
+    return {**render_pool.stats(), "layer_cache": worker_stats["layer_cache"], "background": render_materializer.stats()}
+
+
+@router.get(
+    "/db-pool",
+    status_code=status.HTTP_200_OK,
+    name="Database Pool Stats",
+    response_model=dict,
+)
+def get_db_pool_stats() -> dict:
+    # Return connection pool counters of the API (async) and background (sync) engines
+    return {pool_metrics.name: pool_metrics.stats(), sync_pool_metrics.name: sync_pool_metrics.stats()}
+
+
+@router.get(
+    "/form-cache",
+    status_code=status.HTTP_200_OK,
+    name="Form Cache Stats",
+    response_model=dict,
+)
+def get_form_cache_stats() -> dict:
+    # Return form cache hit/miss counters
+    return form_cache.stats()
+
+
+@router.get(
+    "/password-hashing",
+    status_code=status.HTTP_200_OK,
+    name="Password Hashing Stats",
+    response_model=dict,
+)
+def get_password_hashing_stats() -> dict:
+    # Return password hashing pool queue and run times
+    return password_hasher.stats()
+
+
+@router.get(
+    "/loop-lag",
+    status_code=status.HTTP_200_OK,
+    name="Event Loop Lag",
+    response_model=dict,
+)
+def get_loop_lag() -> dict:
+    # Return event loop lag percentiles and captured stalls
+    return loop_watchdog.stats()
+
+
+@router.get(
+    "/token-cache",
+    status_code=status.HTTP_200_OK,
+    name="Token Cache Stats",
+    response_model=dict,
+)
+def get_token_cache_stats() -> dict:
+    # Return verified JWT cache counters
+    return token_cache.stats()
+
+
+@router.get(
+    "/last-login-buffer",
+    status_code=status.HTTP_200_OK,
+    name="Last Login Buffer Stats",
+    response_model=dict,
+)
+def get_last_login_buffer_stats() -> dict:
+    # Return write-behind counters of the last login updates
+    return last_login_buffer.stats()
+
+
+@router.get(
+    "/signature-stats",
+    status_code=status.HTTP_200_OK,
+    name="Signature Stats",
+    response_model=dict,
+)
+def get_signature_stats() -> dict:
+    # Return sizes of the signature images before and after preprocessing
+    return signature_processor.stats()
+
+
+@router.get(
+    "/query-stats",
+    status_code=status.HTTP_200_OK,
+    name="Query Stats",
+    response_model=dict,
+)
+def get_query_stats() -> dict:
+    # Return SQL totals, recent slow queries and requests with repeated statements
+    return query_stats.stats()
+
+
+@router.get(
+    "/logging-stats",
+    status_code=status.HTTP_200_OK,
+    name="Logging Stats",
+    response_model=dict,
+)
+def get_logging_stats() -> dict:
+    # Return queued, pending and dropped log records of the logging queue
+    return log_queue_handler.stats()
+
+
+@router.get(
+    "/log-rotation-stats",
+    status_code=status.HTTP_200_OK,
+    name="Log Rotation Stats",
+    response_model=dict,
+)
+def get_log_rotation_stats() -> dict:
+    # Return compressed and deleted log segments and the space the rotated logs take
+    return log_compressor.stats()
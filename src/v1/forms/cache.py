@@ -0,0 +1,121 @@
+import dataclasses
+import collections
+import threading
+import datetime
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+
+from src.database.models.forms import Form
+from src.v1.forms.conditional import make_etag
+from src.v1.forms.schemas import FormModel
+from src.config import config
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedForm:
+    form: FormModel
+    etag: str
+    last_modified: datetime.datetime
+
+
+def normalize_form_name(locate: str, gdpr: bool = False) -> str:
+    form_name = str(locate).strip().lower()
+    return f"{form_name}_gdpr" if gdpr else form_name
+
+
+class FormCache:
+    """Per-process LRU cache of forms keyed by normalized form name.
+
+    Entries expire after ``ttl`` seconds, which also bounds how long other API workers serve a form
+    after it was edited; the worker handling the edit invalidates its own entry immediately.
+
+    Every invalidation bumps the generation. A read-through fill passes the generation it started with to
+    ``set``, a fill that raced with an invalidation (and may have read the old row) is not stored.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 1)
+        self._entries: collections.OrderedDict[str, tuple[float, CachedForm]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "stale_fills": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, form_name: str) -> CachedForm | None:
+        with self._lock:
+            entry = self._entries.get(form_name)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[form_name]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(form_name)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, form_name: str, form: CachedForm, generation: int | None = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self._stats["stale_fills"] += 1
+                return
+            self._entries[form_name] = (time.monotonic() + self.ttl, form)
+            self._entries.move_to_end(form_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, form_name: str) -> None:
+        with self._lock:
+            self._entries.pop(form_name, None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), forms=list(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["ttl_seconds"] = self.ttl
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+async def get_cached_form(db: AsyncSession, form_name: str) -> CachedForm | None:
+    # Read-through: serve from the cache, load and remember the form on a miss
+    cached = form_cache.get(form_name)
+    if cached is not None:
+        return cached
+
+    # Taken before the query, an invalidation while the form is loaded discards this fill
+    generation = form_cache.generation
+    form_data = (await db.execute(select(Form).where(Form.name == form_name).options(joinedload(Form.updater)))).scalar_one_or_none()
+    if not form_data:
+        return None
+    form = FormModel.model_validate(form_data, from_attributes=True)
+    # Strong ETag over the whole representation, computed once per cache fill
+    cached = CachedForm(form=form, etag=make_etag(form.model_dump_json()), last_modified=form.updated_at)
+    form_cache.set(form_name, cached, generation)
+    return cached
+
+
+form_cache = FormCache(ttl=config.FORM_CACHE_TTL_SECONDS, max_entries=config.FORM_CACHE_MAX_ENTRIES)
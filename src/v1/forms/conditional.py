@@ -0,0 +1,51 @@
+import email.utils
+import datetime
+import hashlib
+
+from fastapi.responses import Response
+from fastapi import status
+
+# Clients may keep a copy but must revalidate it on every request
+FORMS_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def http_date(value: datetime.datetime) -> str:
+    # Naive database timestamps are in the server's local time
+    return email.utils.format_datetime(value.astimezone(datetime.timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: datetime.datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": FORMS_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime.datetime | None,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if if_modified_since and last_modified is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return last_modified.astimezone(datetime.timezone.utc).replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
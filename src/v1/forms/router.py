@@ -1,11 +1,15 @@
-from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.sql import func
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import joinedload
 from sqlalchemy import select
-from fastapi import status, HTTPException, APIRouter, Depends
+from fastapi import status, HTTPException, APIRouter, Depends, Header
 
+from src.database.models.users import User
 from src.database.models.forms import Form
+from src.v1.forms.conditional import not_modified_response, is_not_modified, cache_headers, make_etag
 from src.v1.forms.schemas import FormCreateModel, ResponseModel, FormModel
+from src.v1.forms.cache import normalize_form_name, get_cached_form, form_cache
 from src.auth.schemas import AuthUser
 from src.database import get_db
 from src.logger import app_logger
@@ -20,21 +24,31 @@ router = APIRouter()
     name="Get Form",
     response_model=FormModel,
 )
-def get_form(locate: str, gdpr: bool = False, db: Session = Depends(get_db)) -> None:
+async def get_form(
+    response: Response,
+    locate: str,
+    gdpr: bool = False,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> None:
     try:
         # Form Conditions
-        form_name = str(locate).strip().lower()
-        if gdpr:
-            form_name = f"{locate}_gdpr"
-        # Get all forms from the database
-        form_data = db.execute(select(Form).where(Form.name == form_name).options(joinedload(Form.updater))).scalar_one_or_none()
+        form_name = normalize_form_name(locate, gdpr)
+        # Get the form from the cache or the database
+        form_data = await get_cached_form(db, form_name)
         if not form_data:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"detail": f"Form with name '{form_name}' not found."},
             )
+        # Unchanged since the client's copy
+        headers = cache_headers(form_data.etag, form_data.last_modified)
+        if is_not_modified(form_data.etag, form_data.last_modified, if_none_match, if_modified_since):
+            return not_modified_response(headers)
         # Return the form data
-        return form_data
+        response.headers.update(headers)
+        return form_data.form
     except Exception as e:
         app_logger.exception(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"There is a problem with fetching form data.")
@@ -47,10 +61,36 @@ def get_form(locate: str, gdpr: bool = False, db: Session = Depends(get_db)) ->
     dependencies=[Depends(get_auth_user)],
     response_model=list[FormModel],
 )
-def get_forms(db: Session = Depends(get_db)) -> None:
+async def get_forms(
+    response: Response,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+) -> None:
     try:
+        # Version of the whole list from a cheap aggregate, content is not loaded. The updaters are joined,
+        # the list shows their names and renaming a user touches users.updated_at
+        count, max_id, sum_id, forms_modified, sum_updated_by, users_modified = (
+            await db.execute(
+                select(
+                    func.count(Form.id),
+                    func.max(Form.id),
+                    func.sum(Form.id),
+                    func.max(Form.updated_at),
+                    func.sum(Form.updated_by),
+                    func.max(User.updated_at),
+                ).outerjoin(User, User.id == Form.updated_by)
+            )
+        ).one()
+        etag = make_etag(count, max_id, sum_id, forms_modified, sum_updated_by, users_modified)
+        last_modified = max((value for value in (forms_modified, users_modified) if value is not None), default=None)
+        headers = cache_headers(etag, last_modified)
+        if is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+            return not_modified_response(headers)
+        response.headers.update(headers)
+
         # Get all forms from the database
-        forms_data = db.execute(select(Form).options(joinedload(Form.updater))).scalars().all()
+        forms_data = (await db.execute(select(Form).options(joinedload(Form.updater)))).scalars().all()
         # Use Pydantic to convert ORM objects to dicts
         return forms_data
     except Exception as e:
@@ -65,13 +105,13 @@ def get_forms(db: Session = Depends(get_db)) -> None:
     dependencies=[Depends(get_auth_user)],
     response_model=ResponseModel,
 )
-def create_form(data: FormCreateModel, db: Session = Depends(get_db), user: AuthUser = Depends(get_auth_user)) -> None:
+async def create_form(data: FormCreateModel, db: AsyncSession = Depends(get_db), user: AuthUser = Depends(get_auth_user)) -> None:
     try:
         # Variables
         form_name = str(data.name).strip().lower()
 
         # Validate form
-        form_data = db.execute(select(Form).where(Form.name == form_name)).scalar_one_or_none()
+        form_data = (await db.execute(select(Form).where(Form.name == form_name))).scalar_one_or_none()
         if form_data:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Form with name '{form_name}' already exists.")
 
@@ -83,7 +123,8 @@ def create_form(data: FormCreateModel, db: Session = Depends(get_db), user: Auth
             content=data.content,
         )
         db.add(form)
-        db.commit()
+        await db.commit()
+        form_cache.invalidate(form_name)
 
         # Return the created form
         return {}
@@ -99,17 +140,20 @@ def create_form(data: FormCreateModel, db: Session = Depends(get_db), user: Auth
     dependencies=[Depends(get_auth_user)],
     response_model=ResponseModel,
 )
-def edit_form(form_id: int, data: FormCreateModel, db: Session = Depends(get_db), user: AuthUser = Depends(get_auth_user)) -> None:
+async def edit_form(
+    form_id: int, data: FormCreateModel, db: AsyncSession = Depends(get_db), user: AuthUser = Depends(get_auth_user)
+) -> None:
     try:
         # Fetch the order to ensure it exists
-        form = db.execute(select(Form).where(Form.id == form_id)).scalar_one_or_none()
+        form = (await db.execute(select(Form).where(Form.id == form_id))).scalar_one_or_none()
         if not form:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
         # Edit record
         form.updated_by = user.id
         form.updated_at = func.now()
         form.content = data.content
-        db.commit()
+        await db.commit()
+        form_cache.invalidate(form.name)
 
         # Return all companies from the database
         return {}
@@ -125,13 +169,14 @@ def edit_form(form_id: int, data: FormCreateModel, db: Session = Depends(get_db)
     dependencies=[Depends(get_auth_user)],
     response_model=ResponseModel,
 )
-def delete_form(form_id: int, db: Session = Depends(get_db)) -> None:
+async def delete_form(form_id: int, db: AsyncSession = Depends(get_db)) -> None:
     try:
-        form = db.execute(select(Form).where(Form.id == form_id)).scalar_one_or_none()
+        form = (await db.execute(select(Form).where(Form.id == form_id))).scalar_one_or_none()
         if not form:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found.")
-        db.delete(form)
-        db.commit()
+        await db.delete(form)
+        await db.commit()
+        form_cache.invalidate(form.name)
         # Return response
         return {}
     except HTTPException:
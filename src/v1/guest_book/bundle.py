@@ -0,0 +1,108 @@
+import datetime
+import zipfile
+import io
+from typing import Iterator
+
+from sqlalchemy import select
+
+from src.database.models.guest_books import GuestBook, RENDER_STATE_DONE
+from src.v1.guest_book.queries import apply_guest_book_filters
+from src.v1.guest_book.files import build_pdf_filename
+from src.database import SessionLocal
+from src.storage import get_blob_store
+from src.logger import app_logger
+
+BUNDLE_BATCH_SIZE = 100
+BUNDLE_CHUNK_SIZE = 256 * 1024
+BUNDLE_COMPRESS_LEVEL = 1  # PDFs are already compressed, a fast level keeps the CPU cost low
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink for ``zipfile``; it is not seekable, so entries are written with data descriptors."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_pdf(db, row) -> io.IOBase:
+    if row.pdf_sha256:
+        return get_blob_store(row.pdf_storage).open(row.pdf_sha256)
+    # Legacy rows keep the PDF in the database, load just this one
+    return io.BytesIO(db.execute(select(GuestBook.pdf_file).where(GuestBook.id == row.id)).scalar_one())
+
+
+def iter_guest_book_bundle(
+    ids: list[int] | None = None,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+) -> Iterator[bytes]:
+    """Build the ZIP archive incrementally while guests are fetched in batches.
+
+    Only the PDF being copied (at most one chunk of it) and the ZIP central directory are kept in memory.
+    """
+    stmt = select(
+        GuestBook.id,
+        GuestBook.created_at,
+        GuestBook.first_name,
+        GuestBook.last_name,
+        GuestBook.pdf_sha256,
+        GuestBook.pdf_storage,
+    ).where(GuestBook.render_state == RENDER_STATE_DONE)
+    stmt = apply_guest_book_filters(stmt, date_from=date_from, date_to=date_to)
+    if ids:
+        stmt = stmt.where(GuestBook.id.in_(ids))
+
+    sink = _ZipStream()
+    filenames: set[str] = set()
+    last_id = 0
+    written = 0
+
+    db = SessionLocal()
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=BUNDLE_COMPRESS_LEVEL) as archive:
+            while True:
+                rows = db.execute(stmt.where(GuestBook.id > last_id).order_by(GuestBook.id).limit(BUNDLE_BATCH_SIZE)).all()
+                if not rows:
+                    break
+
+                for row in rows:
+                    last_id = row.id
+                    # Same name as the single download, made unique within the archive
+                    filename = build_pdf_filename(row.last_name, row.first_name, row.created_at)
+                    if filename in filenames:
+                        filename = filename.replace(".pdf", f"_{row.id}.pdf")
+                    filenames.add(filename)
+
+                    try:
+                        source = _open_pdf(db, row)
+                    except Exception as e:
+                        app_logger.exception(e)
+                        continue
+
+                    # Opened by name, the entry takes the archive's compression and level
+                    with source, archive.open(filename, mode="w") as target:
+                        while chunk := source.read(BUNDLE_CHUNK_SIZE):
+                            target.write(chunk)
+                            yield sink.pop()
+                    written += 1
+                    yield sink.pop()
+
+        # Central directory, written when the archive is closed
+        yield sink.pop()
+    finally:
+        # Also reached when a client disconnect closes the generator, the connection goes back to the pool
+        db.close()
+    app_logger.info(f"Guest book bundle finished, {written} PDFs")
@@ -0,0 +1,61 @@
+import datetime
+import json
+import csv
+import io
+from typing import AsyncIterator
+
+from sqlalchemy import select
+
+from src.database.models.guest_books import GuestBook
+from src.v1.guest_book.queries import apply_guest_book_filters, GUEST_BOOK_LIST_COLUMNS
+from src.database import AsyncSessionLocal
+from src.logger import app_logger
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+EXPORT_FIELDS = [column.key for column in GUEST_BOOK_LIST_COLUMNS]
+
+
+def _format_value(value):
+    return value.isoformat() if isinstance(value, (datetime.datetime, datetime.date)) else value
+
+
+def _ndjson_chunk(rows) -> str:
+    lines = (json.dumps({key: _format_value(value) for key, value in row._mapping.items()}, ensure_ascii=False) for row in rows)
+    return "".join(line + "\n" for line in lines)
+
+
+def _csv_chunk(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_format_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def iter_guest_book_export(export_format: str, **filters) -> AsyncIterator[str]:
+    """Stream the guest book batch by batch from a server-side cursor.
+
+    The generator owns its session, it outlives the request dependency while the response is being sent.
+    """
+    stmt = apply_guest_book_filters(select(*GUEST_BOOK_LIST_COLUMNS), **filters).order_by(GuestBook.created_at, GuestBook.id)
+
+    if export_format == "csv":
+        # BOM so Excel opens the file as UTF-8
+        yield "\ufeff" + _csv_chunk([], header=True)
+
+    exported = 0
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                exported += len(rows)
+                yield _csv_chunk(rows) if export_format == "csv" else _ndjson_chunk(rows)
+        except Exception as e:
+            app_logger.exception(e)
+            raise
+    app_logger.info(f"Guest book export finished, {exported} rows as {export_format}")
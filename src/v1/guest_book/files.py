@@ -0,0 +1,19 @@
+import unicodedata
+import datetime
+
+from src.storage import get_blob_store
+
+
+def store_pdf(pdf_bytes: bytes) -> dict:
+    # Write the PDF to the blob store and return the GuestBook columns referencing it
+    stored = get_blob_store().put(pdf_bytes)
+    return {"pdf_file": None, "pdf_sha256": stored.sha256, "pdf_size": stored.size, "pdf_storage": stored.backend}
+
+
+def remove_diacritics(text: str) -> str:
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in normalized if not unicodedata.combining(char))
+
+
+def build_pdf_filename(last_name: str, first_name: str, created_at: datetime.datetime) -> str:
+    return remove_diacritics(f"{last_name}_{first_name}_{created_at.strftime('%Y%m%d_%H%M%S')}.pdf".lower().strip())
@@ -1,132 +1,29 @@
 import sys
-import re
 import io
 
 # WeasyPrint is not supported on Windows, so we conditionally import it only on non-Windows platforms
 if sys.platform != "win32":
     from weasyprint import HTML
 
-from jinja2 import Template
-
+from src.v1.guest_book.template_registry import template_registry
+from src.v1.guest_book.render_context import get_render_context
 from src.v1.guest_book.schemas import RegisterModel
+from src.v1.guest_book.layers import body_layer_cache
+from src.config import config
 
+GUEST_FORM_TEMPLATE = "guest_form.html"
+LAYER_BODY = "body"
+LAYER_GUEST = "guest"
 
-def generate_form(data: RegisterModel, form_data: str) -> io.BytesIO:
-    # Build the HTML template with Jinja2
-    html_template = """
-    <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                @page {
-                    margin-top: 8mm;
-                    margin-bottom: 8mm;
-                    margin-left: 15mm;
-                    margin-right: 15mm;
-                }
-                body {
-                    font-family: sans-serif;
-                    font-size: 12px;
-                }
-                h1, h2, h3, h4, h5, h6 {
-                    color: #01579b !important;
-                }
-                h1 {
-                    font-size: 24px;
-                }
-                hr {
-                    border: 1px solid #ccc;
-                }
-                .ql-align-left {
-                    text-align: left;
-                }
-                .ql-align-center {
-                    text-align: center;
-                }
-                .ql-align-right {
-                    text-align: right;
-                }
-                img {
-                    max-width: 70px;
-                    height: auto;
-                }
-                .signature {
-                    margin-top: 10px;
-                    max-width: 240px;
-                    max-height: 120px;
-                    border: 1px solid #ccc;
-                    display: block;
-                }
-                .form-group {
-                    margin-bottom: 10px;
-                }
-                .label {
-                    font-weight: bold;
-                    display: inline-block;
-                    min-width: 150px;
-                    color: #555;
-                }
-                .value {
-                    display: inline-block;
-                    color: #000;
-                }
-                .section {
-                    margin-top: 20px;
-                }
-                .checkmark {
-                    color: green;
-                    font-weight: bold;
-                }
-            </style>
-        </head>
-        <body>
-            <h1>{{ header }}</h1>
-            <hr />
-            {{ form_details | safe }}
-            <hr />
-            <div class="section">
-                <div class="form-group">
-                    <span class="label">{{ first_name_label }}:</span>
-                    <span class="value">{{ first_name }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ last_name_label }}:</span>
-                    <span class="value">{{ last_name }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ company_label }}:</span>
-                    <span class="value">{{ company }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ phone_label }}:</span>
-                    <span class="value">{{ phone }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ email_label }}:</span>
-                    <span class="value">{{ email }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ safety_instructions_label }}:</span>
-                    <span class="value checkmark">✓ {{ safety_instructions }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ gdpr_consent_label }}:</span>
-                    <span class="value checkmark">✓ {{ gdpr_consent }}</span>
-                </div>
-                <div class="form-group">
-                    <span class="label">{{ signature_label }}:</span>
-                    <br />
-                    <img class="signature" src="{{ signature_data }}" alt="Signature"/>
-                </div>
-            </div>
-        </body>
-    </html>
-    """
+
+def _render_html(data: RegisterModel, form_details: str, layer: str | None = None) -> str:
     # Render the HTML template with the provided data
-    template = Template(html_template)
-    rendered_html = template.render(
+    return template_registry.render(
+        GUEST_FORM_TEMPLATE,
+        data.locate,
+        layer=layer,
         header=data.header,
-        form_details=re.sub(r"&nbsp;", " ", form_data).strip(),
+        form_details=form_details,
         first_name_label=get_field_label("first_name", data.locate),
         first_name=data.name,
         last_name_label=get_field_label("last_name", data.locate),
@@ -144,8 +41,30 @@ def generate_form(data: RegisterModel, form_data: str) -> io.BytesIO:
         signature_label=get_field_label("signature", data.locate),
         signature_data=data.signature,
     )
-    # Convert the rendered HTML to PDF
-    pdf_bytes = HTML(string=rendered_html).write_pdf()
+
+
+def generate_form(data: RegisterModel, form_data: str) -> io.BytesIO:
+    context = get_render_context()
+    form_details = form_data.replace("&nbsp;", " ").strip()
+
+    if not config.RENDER_TWO_LAYER:
+        # Convert the rendered HTML to PDF with the shared stylesheet and fonts
+        rendered_html = _render_html(data, form_details)
+        pdf_bytes = HTML(string=rendered_html).write_pdf(stylesheets=context.stylesheets, font_config=context.font_config)
+        return io.BytesIO(pdf_bytes)
+
+    # The form text is the same for every guest, so its layout is cached and only the guest section is laid out
+    body = body_layer_cache.get_or_render(
+        body_layer_cache.make_key(str(data.locate), data.header, form_details),
+        lambda: HTML(string=_render_html(data, form_details, LAYER_BODY)).render(
+            stylesheets=context.stylesheets, font_config=context.font_config
+        ),
+    )
+    guest = HTML(string=_render_html(data, form_details, LAYER_GUEST)).render(
+        stylesheets=context.stylesheets, font_config=context.font_config
+    )
+    # The guest section starts on a new page after the form text
+    pdf_bytes = guest.copy([*body.pages, *guest.pages]).write_pdf()
     # Return the PDF as a BytesIO object
     return io.BytesIO(pdf_bytes)
 
@@ -0,0 +1,62 @@
+import collections
+import threading
+import hashlib
+from typing import Callable, Any
+
+from src.config import config
+
+
+class LayerCache:
+    """Per-process LRU of laid-out WeasyPrint documents for the two-layer rendering mode.
+
+    Keys are content hashes (see ``make_key``), so an edited form gets a new key and its old layout simply
+    ages out; nothing has to be invalidated explicitly.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(max_entries, 0)
+        self._entries: collections.OrderedDict[str, Any] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Any:
+        with self._lock:
+            document = self._entries.get(key)
+            if document is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return document
+            self._stats["misses"] += 1
+
+        # Layout runs outside the lock, two threads missing the same key just both render it
+        document = render()
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = document
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return document
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def counters(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+    def stats(self) -> dict:
+        return dict(self.counters(), max_entries=self.max_entries)
+
+
+body_layer_cache = LayerCache(max_entries=config.RENDER_LAYER_CACHE_MAX_ENTRIES)
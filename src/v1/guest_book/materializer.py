@@ -0,0 +1,185 @@
+import concurrent.futures
+import threading
+import datetime
+import socket
+import uuid
+import time
+import json
+import os
+
+from sqlalchemy import update, select, and_, or_
+
+from src.database.models.guest_books import (
+    GuestBook,
+    RENDER_STATE_RENDERING,
+    RENDER_STATE_PENDING,
+    RENDER_STATE_FAILED,
+    RENDER_STATE_DONE,
+)
+from src.v1.guest_book.renderer import render_pool, RenderQueueFullError
+from src.v1.guest_book.schemas import RegisterModel
+from src.v1.guest_book.files import store_pdf
+from src.database import SessionLocal
+from src.logger import app_logger
+from src.config import config
+
+
+def build_submission(data: RegisterModel, form_content: str) -> str:
+    # Snapshot of everything needed to render the PDF later, independent of later form edits
+    return json.dumps({"data": data.model_dump(), "form_content": form_content})
+
+
+def _utcnow() -> datetime.datetime:
+    # render_lease_until is a naive UTC DateTime, compared by all API processes
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class RenderMaterializer:
+    """Background workers which render PDFs of guest book rows stored in the ``pending`` state.
+
+    A row is claimed with one conditional ``UPDATE`` (``pending`` -> ``rendering`` with an owner and a lease)
+    before it is rendered, so with several API workers or instances every row is rendered once. Rows left
+    pending, or claimed by a process which died before its lease ran out, are picked up by a sweep on start and
+    every ``lease_seconds``. ``start`` is called once from the application lifespan.
+    """
+
+    def __init__(self, workers: int, lease_seconds: float):
+        self.workers = max(workers, 1)
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        # Rows waiting in this process, a sweep does not queue them again
+        self._queued_ids: set[int] = set()
+        self._sweeper: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "done": 0, "failed": 0, "claimed": 0, "claim_conflicts": 0, "resumed": 0}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf-materializer")
+            self._stopping.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="pdf-materializer-sweep", daemon=True)
+        self._sweeper.start()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+            sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None:
+            sweeper.join()
+        if executor is not None:
+            # Queued rows stay pending in the database and are resumed on the next start
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def enqueue(self, guest_book_id: int) -> None:
+        with self._lock:
+            executor = self._executor
+            if executor is None or guest_book_id in self._queued_ids:
+                # Not started (e.g. during shutdown) the row stays pending for the next sweep
+                return
+            self._queued_ids.add(guest_book_id)
+            self._stats["queued"] += 1
+        executor.submit(self._materialize, guest_book_id)
+
+    def _sweep_loop(self) -> None:
+        # Off the event loop: the first sweep runs right after start, then once per lease
+        while True:
+            try:
+                self._sweep()
+            except Exception as e:
+                app_logger.exception(e)
+            if self._stopping.wait(self.lease_seconds):
+                return
+
+    def _sweep(self) -> None:
+        with SessionLocal() as db:
+            ids = db.execute(select(GuestBook.id).where(self._claimable())).scalars().all()
+        with self._lock:
+            ids = [guest_book_id for guest_book_id in ids if guest_book_id not in self._queued_ids]
+            self._stats["resumed"] += len(ids)
+        for guest_book_id in ids:
+            self.enqueue(guest_book_id)
+        if ids:
+            app_logger.info(f"Resumed rendering of {len(ids)} pending guest book PDFs")
+
+    @staticmethod
+    def _claimable():
+        return or_(
+            GuestBook.render_state == RENDER_STATE_PENDING,
+            and_(GuestBook.render_state == RENDER_STATE_RENDERING, GuestBook.render_lease_until < _utcnow()),
+        )
+
+    def _claim(self, db, guest_book_id: int) -> bool:
+        lease_until = _utcnow() + datetime.timedelta(seconds=self.lease_seconds)
+        result = db.execute(
+            update(GuestBook)
+            .where(GuestBook.id == guest_book_id, self._claimable())
+            .values(render_state=RENDER_STATE_RENDERING, render_owner=self.owner, render_lease_until=lease_until)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _extend_lease(self, guest_book_id: int) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                update(GuestBook)
+                .where(GuestBook.id == guest_book_id, GuestBook.render_owner == self.owner)
+                .values(render_lease_until=_utcnow() + datetime.timedelta(seconds=self.lease_seconds))
+            )
+            db.commit()
+
+    def _render(self, guest_book_id: int, data: RegisterModel, form_content: str) -> bytes:
+        # Background jobs wait for a free render slot instead of failing like kiosk requests do
+        while True:
+            try:
+                return render_pool.render(data, form_content)
+            except RenderQueueFullError as e:
+                time.sleep(e.retry_after)
+                self._extend_lease(guest_book_id)
+
+    def _materialize(self, guest_book_id: int) -> None:
+        try:
+            with SessionLocal() as db:
+                if not self._claim(db, guest_book_id):
+                    # Rendered, or claimed by another worker meanwhile
+                    with self._lock:
+                        self._stats["claim_conflicts"] += 1
+                    return
+                with self._lock:
+                    self._stats["claimed"] += 1
+
+                submission = db.execute(select(GuestBook.submission).where(GuestBook.id == guest_book_id)).scalar_one()
+                values = {"render_state": RENDER_STATE_DONE, "render_error": None, "submission": None}
+                try:
+                    payload = json.loads(submission)
+                    data = RegisterModel(**payload["data"])
+                    values.update(store_pdf(self._render(guest_book_id, data, payload["form_content"])))
+                except Exception as e:
+                    app_logger.exception(f"Rendering guest book {guest_book_id} failed: {e!r}")
+                    values = {"render_state": RENDER_STATE_FAILED, "render_error": str(e)[:1000] or type(e).__name__}
+
+                # Only written while the claim is ours, a worker whose lease expired and was taken over loses
+                owned = and_(GuestBook.id == guest_book_id, GuestBook.render_owner == self.owner)
+                values.update(render_owner=None, render_lease_until=None)
+                db.execute(update(GuestBook).where(owned, GuestBook.render_state == RENDER_STATE_RENDERING).values(**values))
+                db.commit()
+
+            with self._lock:
+                self._stats[values["render_state"]] += 1
+        except Exception as e:
+            app_logger.exception(e)
+        finally:
+            with self._lock:
+                self._queued_ids.discard(guest_book_id)
+                self._stats["queued"] -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, workers=self.workers, owner=self.owner, lease_seconds=self.lease_seconds)
+
+
+render_materializer = RenderMaterializer(workers=config.RENDER_BACKGROUND_WORKERS, lease_seconds=config.RENDER_LEASE_SECONDS)
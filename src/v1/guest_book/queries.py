@@ -0,0 +1,72 @@
+import datetime
+import base64
+import json
+
+from sqlalchemy import select, and_, or_, Select
+
+from src.database.models.guest_books import GuestBook
+
+# Columns returned by guest book listings, the PDF columns are never selected
+GUEST_BOOK_LIST_COLUMNS = (
+    GuestBook.id,
+    GuestBook.created_at,
+    GuestBook.first_name,
+    GuestBook.last_name,
+    GuestBook.company,
+    GuestBook.phone,
+    GuestBook.email,
+    GuestBook.render_state,
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime.datetime, guest_book_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), guest_book_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, guest_book_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(created_at), int(guest_book_id)
+    except Exception:
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'")
+
+
+def prefix_pattern(value: str) -> str:
+    # Literal LIKE pattern so MySQL can use the index for a prefix range scan
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+
+
+def apply_guest_book_filters(
+    stmt: Select,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    company: str | None = None,
+    name: str | None = None,
+) -> Select:
+    if date_from:
+        stmt = stmt.where(GuestBook.created_at >= datetime.datetime.combine(date_from, datetime.time.min))
+    if date_to:
+        # Inclusive end date
+        stmt = stmt.where(GuestBook.created_at < datetime.datetime.combine(date_to + datetime.timedelta(days=1), datetime.time.min))
+    if company and company.strip():
+        stmt = stmt.where(GuestBook.company.like(prefix_pattern(company.strip()), escape="/"))
+    if name and name.strip():
+        pattern = prefix_pattern(name.strip())
+        stmt = stmt.where(or_(GuestBook.last_name.like(pattern, escape="/"), GuestBook.first_name.like(pattern, escape="/")))
+    return stmt
+
+
+def build_guest_book_page_query(limit: int, cursor: str | None = None, **filters) -> Select:
+    # Newest first, keyset on (created_at, id) so deep pages cost the same as the first one
+    stmt = apply_guest_book_filters(select(*GUEST_BOOK_LIST_COLUMNS), **filters)
+    if cursor:
+        created_at, guest_book_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(GuestBook.created_at < created_at, and_(GuestBook.created_at == created_at, GuestBook.id < guest_book_id)))
+    # One extra row tells whether there is a next page
+    return stmt.order_by(GuestBook.created_at.desc(), GuestBook.id.desc()).limit(limit + 1)
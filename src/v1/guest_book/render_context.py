@@ -0,0 +1,67 @@
+import threading
+import glob
+import sys
+import os
+from pathlib import Path
+
+# WeasyPrint is not supported on Windows, so we conditionally import it only on non-Windows platforms
+if sys.platform != "win32":
+    from weasyprint.text.fonts import FontConfiguration
+    from weasyprint import CSS
+
+from src.v1.guest_book.template_registry import template_registry
+from src.logger import app_logger
+from src.config import config
+
+GUEST_FORM_STYLESHEET = "guest_form.css"
+FONT_FAMILY = "Open Sans"
+# OpenSans-<variant>.ttf -> (font-weight, font-style)
+FONT_VARIANTS = {
+    "Regular": ("normal", "normal"),
+    "Bold": ("bold", "normal"),
+    "Italic": ("normal", "italic"),
+    "BoldItalic": ("bold", "italic"),
+}
+
+
+def build_font_faces(fonts_path: str) -> str:
+    # @font-face rules for the bundled fonts, so rendering does not depend on the fonts installed on the host
+    rules = []
+    for path in sorted(glob.glob(os.path.join(fonts_path, "OpenSans-*.ttf"))):
+        variant = os.path.splitext(os.path.basename(path))[0].split("-", 1)[1]
+        if variant not in FONT_VARIANTS:
+            continue
+        weight, style = FONT_VARIANTS[variant]
+        rules.append(
+            f'@font-face {{ font-family: "{FONT_FAMILY}"; src: url("{Path(path).resolve().as_uri()}"); '
+            f"font-weight: {weight}; font-style: {style}; }}"
+        )
+    if not rules:
+        app_logger.warning(f"No bundled fonts found in '{fonts_path}', falling back to system fonts")
+    return "\n".join(rules)
+
+
+class RenderContext:
+    """WeasyPrint objects shared by all renders of one process.
+
+    The font configuration keeps fonts resolved by fontconfig between renders and the stylesheet (bundled
+    ``@font-face`` rules plus ``guest_form.css``) is parsed only once.
+    """
+
+    def __init__(self, fonts_path: str, stylesheet: str):
+        self.font_config = FontConfiguration()
+        source = build_font_faces(fonts_path) + "\n" + template_registry.get_source(stylesheet)
+        self.stylesheets = [CSS(string=source, font_config=self.font_config)]
+
+
+_context: RenderContext | None = None
+_lock = threading.Lock()
+
+
+def get_render_context() -> RenderContext:
+    global _context
+    if _context is None:
+        with _lock:
+            if _context is None:
+                _context = RenderContext(fonts_path=config.FONTS_PATH, stylesheet=GUEST_FORM_STYLESHEET)
+    return _context
@@ -0,0 +1,316 @@
+import concurrent.futures
+import threading
+import asyncio
+import signal
+import time
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from src.v1.guest_book.template_registry import template_registry, TemplateRegistry
+from src.v1.guest_book.render_context import get_render_context
+from src.v1.guest_book.schemas import RegisterModel
+from src.v1.guest_book.layers import body_layer_cache
+from src.v1.guest_book.form import generate_form
+from src.monitoring.metrics import observe_render
+from src.logger import app_logger
+from src.config import config
+
+WARM_UP_LOCALES = ("cs", "en", "de")
+# Worker counters which describe the current state, only those of live workers are summed
+WORKER_GAUGES = {"templates", "entries"}
+# 1x1 transparent PNG
+WARM_UP_SIGNATURE = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+
+
+class RenderQueueFullError(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("PDF rendering queue is full")
+        self.retry_after = retry_after
+
+
+class RenderTimeoutError(Exception):
+    pass
+
+
+def _init_worker() -> None:
+    # Runs once in every new worker process, a failure here is retried on the first render
+    try:
+        get_render_context()
+    except Exception as e:
+        app_logger.exception(e)
+
+
+def _on_deadline(signum, frame) -> None:
+    raise RenderTimeoutError("PDF rendering exceeded its deadline")
+
+
+def _worker_counters() -> dict:
+    # Template and layer cache counters live in the worker processes, they travel back with every result
+    return {"pid": os.getpid(), "templates": template_registry.counters(), "layer_cache": body_layer_cache.counters()}
+
+
+def _render_job(data: RegisterModel, form_content: str, deadline: float | None = None) -> tuple[bytes, float, dict]:
+    # Runs inside a worker process, returns the PDF, the time spent rendering it and the worker's counters.
+    # deadline (time.time()) is enforced with SIGALRM where available, a job which waited past it is skipped
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise RenderTimeoutError("PDF render job waited past its deadline")
+        if hasattr(signal, "setitimer"):
+            signal.signal(signal.SIGALRM, _on_deadline)
+            signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        started = time.perf_counter()
+        pdf_bytes = generate_form(data, form_content).getvalue()
+        return pdf_bytes, time.perf_counter() - started, _worker_counters()
+    finally:
+        if deadline is not None and hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _worker_processes(executor: concurrent.futures.ProcessPoolExecutor) -> list:
+    # ProcessPoolExecutor has no public API for its processes; _processes (pid -> Process) exists since
+    # Python 3.2, without it nothing is terminated and the stuck worker keeps running until its job returns
+    processes = getattr(executor, "_processes", None)
+    if not isinstance(processes, dict):
+        return []
+    return list(processes.values())
+
+
+def _sum_counters(total: dict, counters: dict, gauges: bool) -> None:
+    for key, value in counters.items():
+        if key in WORKER_GAUGES and not gauges:
+            continue
+        if isinstance(value, list):
+            total[key] = sorted(set(total.get(key, [])) | set(value))
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def build_warm_up_sample(locale: str) -> RegisterModel:
+    return RegisterModel(
+        name="Warm",
+        surname="Sample",
+        company="Warm Up",
+        phone="123456789",
+        email="warm-up@example.com",
+        signature=WARM_UP_SIGNATURE,
+        locate=locale,
+        header="Warm Up",
+    )
+
+
+class RenderPool:
+    """Renders guest book PDFs in a process pool so WeasyPrint does not hold the API worker's GIL.
+
+    At most ``workers + queue_size`` jobs are accepted at once; further submissions are rejected with
+    ``RenderQueueFullError`` so the caller can answer ``503`` instead of piling up requests.
+
+    The timeout is enforced inside the worker as well; a job still running ``kill_grace`` seconds after its
+    deadline (stuck in native code) gets the worker processes terminated and the pool recycled, so a hung
+    render cannot hold a worker and a slot for good.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, retry_after: int, kill_grace: float):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.queue_size = max(queue_size, 0)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.kill_grace = kill_grace
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        # Executor of every unfinished job, a stuck job recycles the executor it runs in
+        self._executors: dict[concurrent.futures.Future, concurrent.futures.ProcessPoolExecutor] = {}
+        # Latest counters of every worker process by pid, workers replaced by a recycle keep their totals
+        self._worker_counters: dict[int, dict] = {}
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timeouts": 0, "recycled": 0, "in_flight": 0}
+
+    def start(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+                app_logger.info(f"PDF render pool started with {self.workers} workers and queue size {self.queue_size}")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            app_logger.info("PDF render pool stopped")
+
+    def _restart(self, executor: concurrent.futures.ProcessPoolExecutor) -> concurrent.futures.ProcessPoolExecutor:
+        # A crashed worker breaks the whole pool, it is replaced on the next submission
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        app_logger.warning("PDF render pool is broken, restarting")
+        return self.start()
+
+    def _recycle(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            executor = self._executors.get(future)
+            if future.done() or executor is None:
+                return
+            if self._executor is executor:
+                self._executor = None
+            self._stats["recycled"] += 1
+        app_logger.warning(f"PDF render job still running {self.kill_grace} s after its deadline, recycling the render pool")
+        # ProcessPoolExecutor cannot cancel a running job, its processes are terminated; other jobs of this
+        # executor fail with BrokenProcessPool and release their slots
+        processes = _worker_processes(executor)
+        if not processes:
+            app_logger.warning("PDF render worker processes not found, the stuck worker is left running")
+        for process in processes:
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_out(self, future: concurrent.futures.Future) -> RenderTimeoutError:
+        self._count("timeouts")
+        if not future.cancel():
+            timer = threading.Timer(self.kill_grace, self._recycle, args=(future,))
+            timer.daemon = True
+            timer.start()
+        return RenderTimeoutError(f"PDF rendering did not finish within {self.timeout} seconds")
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        self._slots.release()
+        with self._lock:
+            self._executors.pop(future, None)
+        self._count("in_flight", -1)
+        if future.cancelled() or future.exception() is not None:
+            self._count("failed")
+        else:
+            self._count("completed")
+            counters = future.result()[2]
+            with self._lock:
+                self._worker_counters[counters["pid"]] = counters
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise RenderQueueFullError(self.retry_after)
+
+        executor = self.start()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            executor = self._restart(executor)
+            try:
+                future = executor.submit(fn, *args)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._count("submitted")
+        self._count("in_flight")
+        with self._lock:
+            self._executors[future] = executor
+        future.add_done_callback(self._on_done)
+        return future
+
+    def warm_up(self) -> None:
+        """Render one sample PDF per worker so the first registration does not pay for the cold start.
+
+        The jobs are submitted together, so the pool starts all of its workers, and are not waited for.
+        """
+        started = time.perf_counter()
+
+        def on_done(future: concurrent.futures.Future) -> None:
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                app_logger.warning(f"PDF render warm-up failed: {future.exception()}")
+            else:
+                app_logger.info(f"PDF render worker warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        for index in range(self.workers):
+            sample = build_warm_up_sample(WARM_UP_LOCALES[index % len(WARM_UP_LOCALES)])
+            try:
+                self.submit(_render_job, sample, "<p>Warm up</p>").add_done_callback(on_done)
+            except RenderQueueFullError:
+                break
+
+    @staticmethod
+    def _finish(result: tuple[bytes, float, dict], started: float) -> bytes:
+        pdf_bytes, render_seconds, _ = result
+        observe_render(render_seconds, time.perf_counter() - started - render_seconds, len(pdf_bytes))
+        return pdf_bytes
+
+    def render(self, data: RegisterModel, form_content: str) -> bytes:
+        started = time.perf_counter()
+        future = self.submit(_render_job, data, form_content, time.time() + self.timeout)
+        try:
+            return self._finish(future.result(timeout=self.timeout), started)
+        except concurrent.futures.TimeoutError:
+            raise self._timed_out(future)
+        except RenderTimeoutError:
+            # Stopped by the deadline inside the worker
+            self._count("timeouts")
+            raise
+
+    async def render_async(self, data: RegisterModel, form_content: str) -> bytes:
+        started = time.perf_counter()
+        future = self.submit(_render_job, data, form_content, time.time() + self.timeout)
+        try:
+            return self._finish(await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout), started)
+        except asyncio.TimeoutError:
+            raise self._timed_out(future)
+        except RenderTimeoutError:
+            self._count("timeouts")
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["workers"] = self.workers
+        stats["capacity"] = self.workers + self.queue_size
+        stats["queued"] = max(stats["in_flight"] - self.workers, 0)
+        return stats
+
+    def worker_stats(self) -> dict:
+        """Template and form layer cache counters summed over the render workers.
+
+        Counters are as of each worker's last finished job. Cached templates and layer cache entries are only
+        counted for the workers of the current pool.
+        """
+        with self._lock:
+            snapshots = dict(self._worker_counters)
+            executor = self._executor
+        live = {process.pid for process in _worker_processes(executor)} if executor is not None else set()
+        templates, layer_cache = {}, {}
+        for pid, counters in snapshots.items():
+            # Without the process list every worker counts as live
+            gauges = pid in live or not live
+            _sum_counters(templates, counters["templates"], gauges)
+            _sum_counters(layer_cache, counters["layer_cache"], gauges)
+        return {
+            "workers": len(snapshots.keys() & live) if live else len(snapshots),
+            "templates": TemplateRegistry.summarize(templates),
+            "layer_cache": {
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "entries": 0,
+                **layer_cache,
+                "max_entries": body_layer_cache.max_entries,
+            },
+        }
+
+
+render_pool = RenderPool(
+    workers=config.RENDER_WORKERS,
+    queue_size=config.RENDER_QUEUE_SIZE,
+    timeout=config.RENDER_TIMEOUT_SECONDS,
+    retry_after=config.RENDER_RETRY_AFTER_SECONDS,
+    kill_grace=config.RENDER_KILL_GRACE_SECONDS,
+)
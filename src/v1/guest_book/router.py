@@ -1,18 +1,25 @@
-import unicodedata
-import re
-import io
+import datetime
 
-from fastapi.responses import JSONResponse, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, Response
 from sqlalchemy import select
-from fastapi import status, HTTPException, APIRouter, Depends
+from fastapi import status, HTTPException, APIRouter, Depends, Query
 
-from src.database.models.guest_books import GuestBook
+from src.database.models.guest_books import GuestBook, RENDER_STATE_PENDING, RENDER_STATE_FAILED, RENDER_STATE_DONE, RENDER_ERROR_CODE
+from src.v1.guest_book.materializer import render_materializer, build_submission
+from src.v1.guest_book.signature import signature_processor, SignatureError
+from src.v1.guest_book.renderer import render_pool, RenderQueueFullError, RenderTimeoutError
 from src.v1.guest_book.schemas import *
-from src.database.models.forms import Form
-from src.v1.guest_book.form import generate_form
+from src.v1.guest_book.queries import build_guest_book_page_query, encode_cursor, InvalidCursorError, GUEST_BOOK_LIST_COLUMNS
+from src.v1.guest_book.export import iter_guest_book_export, EXPORT_MEDIA_TYPES
+from src.v1.guest_book.bundle import iter_guest_book_bundle
+from src.v1.guest_book.files import build_pdf_filename, store_pdf
+from src.v1.forms.cache import normalize_form_name, get_cached_form
 from src.database import get_db
+from src.storage import get_blob_store
 from src.logger import app_logger
+from src.config import config
 from src.auth import get_auth_user
 
 router = APIRouter()
@@ -22,25 +29,54 @@ router = APIRouter()
     "/register",
     status_code=status.HTTP_200_OK,
     name="Register guest",
-    response_model=ResponseModel,
+    response_model=RegisterResponseModel,
 )
-def register(data: RegisterModel, db: Session = Depends(get_db)) -> None:
+async def register(data: RegisterModel, db: AsyncSession = Depends(get_db)) -> None:
     try:
-        # Validate signature
-        match = re.match(r"^data:image/.+;base64,(.+)$", data.signature)
-        if not match:
-            return JSONResponse(status_code=400, content={"detail": "Invalid signature image format."})
+        # Validate and shrink the signature image
+        try:
+            signature = await run_in_threadpool(signature_processor.process, data.signature)
+        except SignatureError as e:
+            return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(e)})
+        app_logger.info(
+            f"Signature {signature.width}x{signature.height} px, {signature.original_bytes} -> {signature.processed_bytes} bytes "
+            f"({signature.bytes_saved} saved)"
+        )
+        data = data.model_copy(update={"signature": signature.data_url})
 
         # Get Form
-        form_name = str(data.locate).strip().lower()
-        form_data = db.execute(select(Form).where(Form.name == form_name)).scalar_one_or_none()
+        form_name = normalize_form_name(data.locate)
+        form_data = await get_cached_form(db, form_name)
         if not form_data:
             return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": f"Form with name '{form_name}' not found."})
 
+        # Store the registration at once and render the PDF in the background
+        if config.GUEST_BOOK_ASYNC_RENDER:
+            guest_entry = GuestBook(
+                first_name=data.name,
+                last_name=data.surname,
+                company=data.company,
+                phone=data.phone,
+                email=data.email if data.email and len(data.email) > 0 else None,
+                render_state=RENDER_STATE_PENDING,
+                submission=build_submission(data, form_data.form.content),
+            )
+            db.add(guest_entry)
+            await db.commit()
+            render_materializer.enqueue(guest_entry.id)
+            return {"id": guest_entry.id, "render_state": RENDER_STATE_PENDING}
+
         # Generate PDF file
-        report = generate_form(data, form_data.content)
-        report.seek(0)
-        pdf_bytes = report.getvalue()
+        try:
+            pdf_bytes = await render_pool.render_async(data, form_data.form.content)
+        except RenderQueueFullError as e:
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(e.retry_after)},
+                content={"detail": "PDF rendering is busy, please try again later."},
+            )
+        except RenderTimeoutError:
+            return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": "PDF rendering timed out."})
 
         # Save data to the database
         guest_entry = GuestBook(
@@ -49,18 +85,39 @@ def register(data: RegisterModel, db: Session = Depends(get_db)) -> None:
             company=data.company,
             phone=data.phone,
             email=data.email if data.email and len(data.email) > 0 else None,
-            pdf_file=pdf_bytes,
+            render_state=RENDER_STATE_DONE,
+            **(await run_in_threadpool(store_pdf, pdf_bytes)),
         )
         db.add(guest_entry)
-        db.commit()
+        await db.commit()
 
         # Return response
-        return {}
+        return {"id": guest_entry.id, "render_state": RENDER_STATE_DONE}
     except Exception as e:
         app_logger.exception(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"There is a problem with guest registration.")
 
 
+@router.get(
+    "/render-status/{guest_book_id}",
+    status_code=status.HTTP_200_OK,
+    name="Guest Form Render Status",
+    response_model=RenderStatusModel,
+)
+async def get_render_status(guest_book_id: int, db: AsyncSession = Depends(get_db)) -> None:
+    try:
+        # Only the state columns, never the PDF
+        guest_data = (await db.execute(select(GuestBook.id, GuestBook.render_state).where(GuestBook.id == guest_book_id))).one_or_none()
+        if not guest_data:
+            return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Guest not found"})
+        # Return render status, the render error may contain internals and is only logged
+        error_code = RENDER_ERROR_CODE if guest_data.render_state == RENDER_STATE_FAILED else None
+        return {"id": guest_data.id, "render_state": guest_data.render_state, "error_code": error_code}
+    except Exception as e:
+        app_logger.exception(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"There is a problem with fetching render status.")
+
+
 @router.get(
     "/get-guest-book",
     status_code=status.HTTP_200_OK,
@@ -68,55 +125,162 @@ def register(data: RegisterModel, db: Session = Depends(get_db)) -> None:
     dependencies=[Depends(get_auth_user)],
     response_model=list[GuestBookModel],
 )
-def get_guest_book(db: Session = Depends(get_db)) -> None:
+async def get_guest_book(db: AsyncSession = Depends(get_db)) -> None:
     try:
-        # Get all forms from the database
-        guest_book_data = db.execute(select(GuestBook)).scalars().all()
-        # Use Pydantic to convert ORM objects to dicts
-        return guest_book_data
+        # Get all guests from the database, without the PDF columns
+        guest_book_data = (await db.execute(select(*GUEST_BOOK_LIST_COLUMNS))).all()
+        return [row._asdict() for row in guest_book_data]
     except Exception as e:
         app_logger.exception(e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"There is a problem with fetching guest book data.")
 
 
+@router.get(
+    "/list",
+    status_code=status.HTTP_200_OK,
+    name="List Guest Book",
+    dependencies=[Depends(get_auth_user)],
+    response_model=GuestBookPageModel,
+)
+async def list_guest_book(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    company: str | None = None,
+    name: str | None = None,
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    try:
+        # Get one page of guests, newest first
+        stmt = build_guest_book_page_query(limit, cursor, date_from=date_from, date_to=date_to, company=company, name=name)
+        rows = (await db.execute(stmt)).all()
+
+        # Next page cursor points at the last returned row
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        app_logger.exception(e)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"There is a problem with fetching guest book data.")
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    name="Export Guest Book",
+    dependencies=[Depends(get_auth_user)],
+)
+async def export_guest_book(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    company: str | None = None,
+    name: str | None = None,
+):
+    # Headers
+    filename = f"guest_book_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Access-Control-Expose-Headers": "Content-Disposition",
+    }
+    # Stream rows as they are fetched, the result set is never held in memory
+    return StreamingResponse(
+        iter_guest_book_export(export_format, date_from=date_from, date_to=date_to, company=company, name=name),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.get(
+    "/download-forms",
+    status_code=status.HTTP_200_OK,
+    name="Download Guest Book Forms",
+    dependencies=[Depends(get_auth_user)],
+)
+async def download_reports(
+    ids: list[int] | None = Query(None, max_length=1000),
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+):
+    # Validate filters, the whole guest book is never bundled by accident
+    if not ids and not date_from and not date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide guest ids or a date range.")
+
+    # Headers
+    filename = f"guest_book_forms_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Access-Control-Expose-Headers": "Content-Disposition",
+    }
+    # Stream the archive while it is being built (sync generator, iterated in the threadpool)
+    return StreamingResponse(
+        iter_guest_book_bundle(ids=ids, date_from=date_from, date_to=date_to),
+        media_type="application/zip",
+        headers=headers,
+    )
+
+
 @router.get(
     "/download-form/{guest_book_id}",
     status_code=status.HTTP_200_OK,
     name="Download Guest Book Form",
     dependencies=[Depends(get_auth_user)],
 )
-def download_report(guest_book_id: int, db: Session = Depends(get_db)):
-    def remove_diacritics(text: str) -> str:
-        normalized = unicodedata.normalize("NFKD", text)
-        return "".join(char for char in normalized if not unicodedata.combining(char))
-
+async def download_report(guest_book_id: int, db: AsyncSession = Depends(get_db)):
     try:
-        # Guest Data
-        guest_data = db.execute(select(GuestBook).where(GuestBook.id == guest_book_id)).scalar_one_or_none()
+        # Guest Data, without the legacy PDF column
+        guest_data = (
+            await db.execute(
+                select(
+                    GuestBook.first_name,
+                    GuestBook.last_name,
+                    GuestBook.created_at,
+                    GuestBook.render_state,
+                    GuestBook.pdf_sha256,
+                    GuestBook.pdf_storage,
+                ).where(GuestBook.id == guest_book_id)
+            )
+        ).one_or_none()
         if not guest_data:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Guest not found")
-
-        # Form Data
-        form_data = io.BytesIO(guest_data.pdf_file)
-        form_data.seek(0)
-        form_content = form_data.getvalue()
-        filename = remove_diacritics(
-            f"{guest_data.last_name}_{guest_data.first_name}_{guest_data.created_at.strftime('%Y%m%d_%H%M%S')}.pdf".lower().strip()
-        )
+        if guest_data.render_state != RENDER_STATE_DONE:
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"detail": f"Guest form is not rendered yet ({guest_data.render_state})."},
+            )
 
         # Headers
+        filename = build_pdf_filename(guest_data.last_name, guest_data.first_name, guest_data.created_at)
         headers = {
             "Content-Disposition": f'attachment; name="fieldName"; filename="{filename}"',
-            "Content-Type": "application/pdf",
-            "Content-Length": str(len(form_content)),
             "Access-Control-Expose-Headers": "Content-Disposition",
         }
+
+        # Blob store, served straight from disk when the backend is local
+        if guest_data.pdf_sha256:
+            store = get_blob_store(guest_data.pdf_storage)
+            path = store.local_path(guest_data.pdf_sha256)
+            if path:
+                return FileResponse(path, media_type="application/pdf", headers=headers)
+            return StreamingResponse(store.open(guest_data.pdf_sha256), media_type="application/pdf", headers=headers)
+
+        # Legacy rows not moved to the blob store yet
+        form_content = (await db.execute(select(GuestBook.pdf_file).where(GuestBook.id == guest_book_id))).scalar_one()
+        headers["Content-Length"] = str(len(form_content))
         # Return Success Response
         return Response(
             content=form_content,
             media_type="application/pdf",
             headers=headers,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         app_logger.exception(e)
         raise HTTPException(
@@ -11,6 +11,12 @@ class GuestBookModel(BaseModel):
     company: str
     phone: str
     email: EmailStr | None
+    render_state: str = "done"
+
+
+class GuestBookPageModel(BaseModel):
+    items: list[GuestBookModel]
+    next_cursor: str | None = None
 
 
 class RegisterModel(BaseModel):
@@ -19,7 +25,7 @@ class RegisterModel(BaseModel):
     acknowledged: bool = False
     gdpr: bool = False
     company: str
-    phone: str = Field(..., pattern=r'^(\+\d{1,3}\s?)?\d{3,12}$', description="Phone number")
+    phone: str = Field(..., pattern=r"^(\+\d{1,3}\s?)?\d{3,12}$", description="Phone number")
     email: EmailStr | str
     signature: str
     locate: str
@@ -28,3 +34,14 @@ class RegisterModel(BaseModel):
 
 class ResponseModel(BaseModel):
     success: bool = True
+
+
+class RegisterResponseModel(ResponseModel):
+    id: int | None = None
+    render_state: str | None = None
+
+
+class RenderStatusModel(BaseModel):
+    id: int
+    render_state: str
+    error_code: str | None = None
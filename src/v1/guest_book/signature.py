@@ -0,0 +1,149 @@
+import threading
+import binascii
+import base64
+import re
+import io
+from dataclasses import dataclass
+
+from PIL import ImageOps, Image
+
+from src.config import config
+
+# Only the short "data:image/<type>;base64," header is matched, never the payload
+SIGNATURE_HEADER_PATTERN = re.compile(r"^data:image/(png|jpeg|jpg|gif|webp);base64$")
+SIGNATURE_HEADER_MAX_LENGTH = 32
+SIGNATURE_MAGIC_BYTES = {
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "jpeg": (b"\xff\xd8\xff",),
+    "gif": (b"GIF87a", b"GIF89a"),
+    "webp": (b"RIFF",),
+}
+# Pixels darker than this (after flattening onto white) count as ink when trimming
+SIGNATURE_INK_THRESHOLD = 16
+SIGNATURE_PALETTE_COLORS = 64
+
+
+class SignatureError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ProcessedSignature:
+    data_url: str
+    original_bytes: int
+    processed_bytes: int
+    width: int
+    height: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.processed_bytes
+
+
+class SignatureProcessor:
+    """Normalizes the signature data URL sent by the kiosk before it is embedded in the PDF.
+
+    The size limit is checked before anything else and the base64 payload is decoded once. The image is then
+    validated, trimmed to the ink, downscaled to ``scale`` times the ``.signature`` box of the form template
+    and recompressed to a palette PNG.
+    """
+
+    def __init__(self, max_bytes: int, max_pixels: int, box_width: int, box_height: int, scale: float):
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.max_size = (max(int(box_width * scale), 1), max(int(box_height * scale), 1))
+        self._lock = threading.Lock()
+        self._stats = {"processed": 0, "rejected": 0, "original_bytes": 0, "processed_bytes": 0}
+
+    def _decode(self, data_url: str) -> tuple[str, bytes]:
+        if len(data_url) > self.max_bytes:
+            raise SignatureError(f"Signature image is too large, the limit is {self.max_bytes} bytes.")
+
+        separator = data_url.find(",", 0, SIGNATURE_HEADER_MAX_LENGTH)
+        header = SIGNATURE_HEADER_PATTERN.match(data_url[:separator]) if separator > 0 else None
+        if not header:
+            raise SignatureError("Invalid signature image format.")
+        image_type = "jpeg" if header.group(1) == "jpg" else header.group(1)
+
+        try:
+            payload = base64.b64decode(data_url[separator + 1 :], validate=True)
+        except (binascii.Error, ValueError):
+            raise SignatureError("Invalid signature image encoding.")
+
+        if not payload.startswith(SIGNATURE_MAGIC_BYTES[image_type]) or (image_type == "webp" and payload[8:12] != b"WEBP"):
+            raise SignatureError("Signature image content does not match its type.")
+        return image_type, payload
+
+    def _load(self, payload: bytes) -> Image.Image:
+        try:
+            image = Image.open(io.BytesIO(payload))
+            # The header is parsed lazily, refuse huge canvases before decoding any pixels
+            if image.width * image.height > self.max_pixels:
+                raise SignatureError(f"Signature image is too large, the limit is {self.max_pixels} pixels.")
+            image.load()
+        except SignatureError:
+            raise
+        except Exception:
+            raise SignatureError("Signature image could not be decoded.")
+        return image.convert("RGBA")
+
+    def _trim(self, image: Image.Image) -> Image.Image:
+        # Flatten onto white so both transparent and white canvases are trimmed the same way
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        ink = ImageOps.invert(Image.alpha_composite(background, image).convert("L"))
+        bbox = ink.point(lambda value: 255 if value > SIGNATURE_INK_THRESHOLD else 0).getbbox()
+        if bbox is None:
+            raise SignatureError("Signature is empty.")
+        return image.crop(bbox)
+
+    def _encode(self, image: Image.Image) -> bytes:
+        buffer = io.BytesIO()
+        image.quantize(colors=SIGNATURE_PALETTE_COLORS, method=Image.Quantize.FASTOCTREE).save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    def process(self, data_url: str) -> ProcessedSignature:
+        try:
+            image_type, payload = self._decode(data_url)
+            image = self._trim(self._load(payload))
+        except SignatureError:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise
+
+        image.thumbnail(self.max_size, Image.Resampling.LANCZOS)
+        png = self._encode(image)
+
+        # Keep the original if it is already smaller than the recompressed image
+        if len(png) < len(payload):
+            processed_url = "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+        else:
+            processed_url = f"data:image/{image_type};base64," + base64.b64encode(payload).decode("ascii")
+
+        result = ProcessedSignature(
+            data_url=processed_url,
+            original_bytes=len(data_url),
+            processed_bytes=len(processed_url),
+            width=image.width,
+            height=image.height,
+        )
+        with self._lock:
+            self._stats["processed"] += 1
+            self._stats["original_bytes"] += result.original_bytes
+            self._stats["processed_bytes"] += result.processed_bytes
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["bytes_saved"] = stats["original_bytes"] - stats["processed_bytes"]
+        stats["max_size"] = list(self.max_size)
+        return stats
+
+
+signature_processor = SignatureProcessor(
+    max_bytes=config.SIGNATURE_MAX_BYTES,
+    max_pixels=config.SIGNATURE_MAX_PIXELS,
+    box_width=config.SIGNATURE_BOX_WIDTH,
+    box_height=config.SIGNATURE_BOX_HEIGHT,
+    scale=config.SIGNATURE_SCALE,
+)
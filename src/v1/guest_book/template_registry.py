@@ -0,0 +1,107 @@
+import threading
+import time
+import os
+
+from jinja2 import select_autoescape, FileSystemBytecodeCache, FileSystemLoader, Environment, Template
+
+from src.logger import app_logger
+from src.config import config
+
+# Built-in templates shipped with the application
+BUILTIN_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+
+class TemplateRegistry:
+    """Shared Jinja environment which compiles every template once per process.
+
+    Templates are looked up in ``config.TEMPLATES_PATH`` first (deployment overrides) and then in the built-in
+    ``templates`` folder. A locale specific variant (``guest_form.de.html``) wins over the generic one (``guest_form.html``).
+    """
+
+    def __init__(self, search_paths: list[str], bytecode_cache_path: str | None = None):
+        bytecode_cache = None
+        if bytecode_cache_path:
+            os.makedirs(bytecode_cache_path, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_path)
+
+        self.environment = Environment(
+            loader=FileSystemLoader(search_paths),
+            bytecode_cache=bytecode_cache,
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self._templates: dict[tuple[str, str], Template] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "compiled": 0,
+            "compile_seconds": 0.0,
+            "rendered": 0,
+            "render_seconds": 0.0,
+        }
+
+    @staticmethod
+    def _candidates(name: str, locale: str) -> list[str]:
+        base, ext = os.path.splitext(name)
+        locale = str(locale).strip().lower()
+        return [f"{base}.{locale}{ext}", name] if locale else [name]
+
+    def get_template(self, name: str, locale: str = "") -> Template:
+        key = (name, str(locale).strip().lower())
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                started = time.perf_counter()
+                template = self.environment.select_template(self._candidates(name, locale))
+                elapsed = time.perf_counter() - started
+                self._templates[key] = template
+                self._stats["compiled"] += 1
+                self._stats["compile_seconds"] += elapsed
+                app_logger.info(f"Template '{template.name}' loaded for locale '{key[1]}' in {elapsed * 1000:.2f} ms")
+        return template
+
+    def get_source(self, name: str) -> str:
+        # Raw file from the same search paths, used for assets like stylesheets
+        return self.environment.loader.get_source(self.environment, name)[0]
+
+    def render(self, name: str, locale: str = "", **context) -> str:
+        template = self.get_template(name, locale)
+        started = time.perf_counter()
+        rendered = template.render(**context)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["rendered"] += 1
+            self._stats["render_seconds"] += elapsed
+        return rendered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            if self.environment.cache is not None:
+                self.environment.cache.clear()
+
+    def counters(self) -> dict:
+        # Raw counters, render workers send them to the API process where they are summed
+        with self._lock:
+            counters = dict(self._stats)
+            counters["templates"] = sorted(f"{name}:{locale or '*'}" for name, locale in self._templates)
+        return counters
+
+    @staticmethod
+    def summarize(counters: dict) -> dict:
+        stats = {"compiled": 0, "compile_seconds": 0.0, "rendered": 0, "render_seconds": 0.0, "templates": [], **counters}
+        stats["avg_compile_ms"] = round(stats["compile_seconds"] / stats["compiled"] * 1000, 3) if stats["compiled"] else 0.0
+        stats["avg_render_ms"] = round(stats["render_seconds"] / stats["rendered"] * 1000, 3) if stats["rendered"] else 0.0
+        return stats
+
+    def stats(self) -> dict:
+        return self.summarize(self.counters())
+
+
+template_registry = TemplateRegistry(
+    search_paths=[config.TEMPLATES_PATH, BUILTIN_TEMPLATES_PATH],
+    bytecode_cache_path=config.TEMPLATES_CACHE_PATH if config.TEMPLATES_BYTECODE_CACHE else None,
+)
@@ -0,0 +1,20 @@
+import tempfile
+import os
+
+# src.config reads .env from the working directory, the tests run against a throwaway one
+_ROOT = tempfile.mkdtemp(prefix="roechling-office-api-tests-")
+with open(os.path.join(_ROOT, ".env"), "w", encoding="utf-8") as env_file:
+    env_file.write(
+        "\n".join(
+            [
+                'API_KEY="test"',
+                f'ROOT_PATH="{_ROOT}"',
+                f'DATABASE_URL="sqlite:///{os.path.join(_ROOT, "test.db")}"',
+                'JWT_SECRET_KEY="test"',
+                'JWT_ALGORITHM="HS256"',
+                "JWT_ACCESS_TOKEN_EXPIRE_MINUTES=15",
+                "JWT_ACCESS_TOKEN_EXPIRE_DAYS=1",
+            ]
+        )
+    )
+os.chdir(_ROOT)
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from src.v1.forms.conditional import not_modified_response, is_not_modified, cache_headers, make_etag, http_date
+
+LAST_MODIFIED = datetime.datetime(2025, 1, 31, 12, 0, 0, 500000, tzinfo=datetime.timezone.utc)
+ETAG = make_etag("forms", 3, LAST_MODIFIED)
+
+
+def test_etag_is_quoted_and_stable():
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+    assert make_etag("forms", 3, LAST_MODIFIED) == ETAG
+    assert make_etag("forms", 4, LAST_MODIFIED) != ETAG
+
+
+def test_cache_headers():
+    headers = cache_headers(ETAG, LAST_MODIFIED)
+    assert headers == {"ETag": ETAG, "Cache-Control": "private, no-cache", "Last-Modified": "Fri, 31 Jan 2025 12:00:00 GMT"}
+    assert "Last-Modified" not in cache_headers(ETAG, None)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (ETAG, True),
+        (f"W/{ETAG}", True),
+        (f'"other", {ETAG}', True),
+        ("*", True),
+        ('"other"', False),
+        (ETAG.strip('"'), False),
+    ],
+)
+def test_if_none_match(if_none_match, expected):
+    assert is_not_modified(ETAG, LAST_MODIFIED, if_none_match, None) is expected
+
+
+@pytest.mark.parametrize(
+    "if_modified_since, expected",
+    [
+        ("Fri, 31 Jan 2025 12:00:00 GMT", True),  # sub-second part of the timestamp is ignored
+        ("Fri, 31 Jan 2025 12:00:01 GMT", True),
+        ("Fri, 31 Jan 2025 11:59:59 GMT", False),
+        ("Fri, 31 Jan 2025 13:00:00 +0100", True),
+        ("yesterday", False),
+    ],
+)
+def test_if_modified_since(if_modified_since, expected):
+    assert is_not_modified(ETAG, LAST_MODIFIED, None, if_modified_since) is expected
+
+
+def test_if_none_match_takes_precedence():
+    assert not is_not_modified(ETAG, LAST_MODIFIED, '"other"', http_date(LAST_MODIFIED))
+
+
+def test_no_validators_and_unknown_last_modified():
+    assert not is_not_modified(ETAG, LAST_MODIFIED, None, None)
+    assert not is_not_modified(ETAG, None, None, "Fri, 31 Jan 2025 12:00:00 GMT")
+
+
+def test_not_modified_response_has_no_body():
+    response = not_modified_response(cache_headers(ETAG, LAST_MODIFIED))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
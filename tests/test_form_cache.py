@@ -0,0 +1,47 @@
+import datetime
+import time
+
+from src.v1.forms.schemas import FormModel
+from src.v1.forms.cache import CachedForm, FormCache
+
+
+def _cached(name: str) -> CachedForm:
+    updated_at = datetime.datetime(2025, 1, 31, 12, 0, 0)
+    # The cache never looks into the form
+    form = FormModel.model_construct(id=1, updated_at=updated_at, updated_by=1, name=name, content="<p>x</p>")
+    return CachedForm(form=form, etag=f'"{name}"', last_modified=updated_at)
+
+
+def test_fill_started_before_invalidation_is_not_stored():
+    cache = FormCache(ttl=60, max_entries=10)
+    generation = cache.generation
+    cache.invalidate("en")
+    cache.set("en", _cached("en"), generation)
+    assert cache.get("en") is None
+    assert cache.stats()["stale_fills"] == 1
+
+
+def test_fill_started_after_invalidation_is_stored():
+    cache = FormCache(ttl=60, max_entries=10)
+    cache.invalidate("en")
+    cache.set("en", _cached("en"), cache.generation)
+    assert cache.get("en") is not None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FormCache(ttl=60, max_entries=2)
+    cache.set("cs", _cached("cs"))
+    cache.set("en", _cached("en"))
+    cache.get("cs")
+    cache.set("de", _cached("de"))
+    assert cache.get("en") is None
+    assert cache.get("cs") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    cache = FormCache(ttl=60, max_entries=10)
+    cache.set("en", _cached("en"))
+    now = time.monotonic()
+    monkeypatch.setattr("src.v1.forms.cache.time.monotonic", lambda: now + 61)
+    assert cache.get("en") is None
@@ -0,0 +1,48 @@
+import datetime
+import base64
+import json
+
+import pytest
+
+from src.v1.guest_book.queries import build_guest_book_page_query, encode_cursor, decode_cursor, InvalidCursorError
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime.datetime(2025, 1, 31, 23, 59, 59, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        "e30",  # {}
+        _raw_cursor(["2025-01-31T23:59:59"]),
+        _raw_cursor(["2025-01-31T23:59:59", 1, 2]),
+        _raw_cursor(["31.01.2025", 1]),
+        _raw_cursor(["2025-01-31T23:59:59", "one"]),
+        encode_cursor(datetime.datetime(2025, 1, 31), 42)[:-3],
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_page_query_rejects_tampered_cursor():
+    with pytest.raises(InvalidCursorError):
+        build_guest_book_page_query(limit=50, cursor="not a cursor!")
+
+
+def test_page_query_continues_after_the_cursor():
+    cursor = encode_cursor(datetime.datetime(2025, 1, 31, 12, 0, 0), 42)
+    sql = str(build_guest_book_page_query(limit=50, cursor=cursor).compile(compile_kwargs={"literal_binds": True}))
+    assert "guest_book.created_at < '2025-01-31 12:00:00'" in sql
+    assert "guest_book.id < 42" in sql
+    assert "LIMIT 51" in sql
@@ -0,0 +1,51 @@
+import os
+
+from src.log_rotation import LogCompressor
+
+
+def _segment_names(tmp_path, names: list[str]) -> set[str]:
+    compressor = LogCompressor(compression="none", retention_bytes=0)
+    compressor.register(str(tmp_path / "app.log"))
+    for name in names:
+        (tmp_path / name).write_text("x")
+    return {entry.name for entry in compressor.segments()}
+
+
+def test_segments_match_rotated_and_legacy_names(tmp_path):
+    names = [
+        "app.20250131-235959.log",
+        "app.20250131-235959-1.log.gz",
+        "app.20250131.log",
+        "app.log.20250131.log",
+        "app.log.20250130.log.zst",
+    ]
+    assert _segment_names(tmp_path, names) == set(names)
+
+
+def test_segments_skip_active_and_foreign_files(tmp_path):
+    names = ["app.log", "global.log.20250131.log", "app.log.2025013.log", "app.log.20250131.txt", "app.log.20250131.log.part"]
+    assert _segment_names(tmp_path, names) == set()
+
+
+def test_failed_segment_keeps_the_compressor_running(tmp_path, monkeypatch):
+    compressor = LogCompressor(compression="gzip", retention_bytes=0)
+    compressor.register(str(tmp_path / "app.log"))
+    broken, healthy = tmp_path / "app.20250130.log", tmp_path / "app.20250131.log"
+    broken.write_text("broken")
+    healthy.write_text("healthy")
+    compress = compressor._compress
+
+    def failing(path: str) -> None:
+        if path == str(broken):
+            raise ValueError("unexpected")
+        compress(path)
+
+    monkeypatch.setattr(compressor, "_compress", failing)
+    # start() queues the uncompressed segments left in the directory
+    compressor.start()
+    compressor.stop()
+
+    stats = compressor.stats()
+    assert stats["failed"] == 1
+    assert stats["compressed"] == 1
+    assert os.path.exists(str(healthy) + ".gz")
@@ -0,0 +1,82 @@
+import base64
+import io
+
+import pytest
+from PIL import ImageDraw, Image
+
+from src.v1.guest_book.signature import SignatureProcessor, SignatureError
+
+
+def _data_url(image: Image.Image, image_format: str = "PNG", media_type: str = "png") -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return f"data:image/{media_type};base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _signature(width: int = 1600, height: int = 800, background=(0, 0, 0, 0)) -> Image.Image:
+    image = Image.new("RGBA", (width, height), background)
+    ImageDraw.Draw(image).line(
+        [(width // 4, height // 2), (width // 2, height // 3), (width * 3 // 4, height * 2 // 3)], fill=(20, 30, 120, 255), width=8
+    )
+    return image
+
+
+@pytest.fixture
+def processor() -> SignatureProcessor:
+    return SignatureProcessor(max_bytes=2 * 1024 * 1024, max_pixels=4_000_000, box_width=240, box_height=120, scale=2.0)
+
+
+def test_signature_is_trimmed_downscaled_and_recompressed(processor):
+    data_url = _data_url(_signature())
+    result = processor.process(data_url)
+
+    assert result.data_url.startswith("data:image/png;base64,")
+    assert result.width <= 480 and result.height <= 240
+    assert result.processed_bytes < result.original_bytes
+    image = Image.open(io.BytesIO(base64.b64decode(result.data_url.split(",", 1)[1])))
+    assert image.mode == "P"
+    assert image.size == (result.width, result.height)
+
+
+def test_white_and_transparent_canvases_are_trimmed_alike(processor):
+    transparent = processor.process(_data_url(_signature()))
+    white = processor.process(_data_url(_signature(background=(255, 255, 255, 255)).convert("RGB")))
+    assert (white.width, white.height) == (transparent.width, transparent.height)
+
+
+def test_jpeg_signature_is_accepted(processor):
+    result = processor.process(_data_url(_signature(background=(255, 255, 255, 255)).convert("RGB"), "JPEG", "jpg"))
+    assert result.width <= 480 and result.height <= 240
+
+
+def test_small_original_is_kept(processor):
+    tiny = Image.new("RGBA", (4, 2), (0, 0, 0, 255))
+    data_url = _data_url(tiny)
+    result = processor.process(data_url)
+    assert result.processed_bytes <= len(data_url)
+
+
+@pytest.mark.parametrize(
+    "data_url, message",
+    [
+        ("data:image/svg+xml;base64,PHN2Zz4=", "format"),
+        ("data:image/png;base64,not base64!", "encoding"),
+        ("data:image/png;base64," + base64.b64encode(b"\xff\xd8\xff" + b"0" * 16).decode("ascii"), "does not match"),
+        ("data:image/png;base64," + base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"0" * 16).decode("ascii"), "decoded"),
+        (_data_url(Image.new("RGBA", (64, 32), (0, 0, 0, 0))), "empty"),
+    ],
+)
+def test_invalid_signatures_are_rejected(processor, data_url, message):
+    with pytest.raises(SignatureError, match=message):
+        processor.process(data_url)
+    assert processor.stats()["rejected"] == 1
+
+
+def test_limits_are_checked_before_decoding():
+    processor = SignatureProcessor(max_bytes=64, max_pixels=100, box_width=240, box_height=120, scale=2.0)
+    with pytest.raises(SignatureError, match="bytes"):
+        processor.process("data:image/png;base64," + "A" * 100)
+
+    processor.max_bytes = 2 * 1024 * 1024
+    with pytest.raises(SignatureError, match="pixels"):
+        processor.process(_data_url(_signature(width=20, height=10)))
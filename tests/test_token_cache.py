@@ -0,0 +1,55 @@
+import time
+
+from src.auth.token_cache import VerifiedTokenCache
+from src.auth.schemas import AuthUser
+
+
+def _user(username: str = "user", exp: float | None = None) -> AuthUser:
+    expires = int(exp if exp is not None else time.time() + 3600)
+    return AuthUser(id=1, username=username, first_name="First", last_name="Last", email="user@example.com", is_admin=False, exp=expires)
+
+
+def test_cached_token_is_returned():
+    cache = VerifiedTokenCache(max_entries=10)
+    user = _user()
+    cache.set("token", user)
+    assert cache.get("token") == user
+    assert cache.get("other") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_raw_tokens_are_not_kept():
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.set("secret-token", _user())
+    assert "secret-token" not in cache._entries
+    assert len(cache._entries) == 1
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.set("a", _user("a"))
+    cache.set("b", _user("b"))
+    cache.get("a")
+    cache.set("c", _user("c"))
+    assert cache.get("b") is None
+    assert cache.get("a").username == "a"
+    assert cache.get("c").username == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_with_the_token(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=10)
+    now = time.time()
+    cache.set("token", _user(exp=now + 60))
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    assert cache.get("token") is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = VerifiedTokenCache(max_entries=0)
+    cache.set("token", _user())
+    assert cache.get("token") is None
+    assert cache.stats()["entries"] == 0
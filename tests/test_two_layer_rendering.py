@@ -0,0 +1,77 @@
+import zlib
+import re
+from pathlib import Path
+
+import pytest
+
+try:
+    import weasyprint  # noqa: F401
+except (ImportError, OSError):  # pango and cairo are system libraries
+    pytest.skip("WeasyPrint is not available", allow_module_level=True)
+
+from src.v1.guest_book.renderer import build_warm_up_sample
+from src.v1.guest_book.layers import body_layer_cache
+from src.v1.guest_book.form import generate_form
+from src.v1.guest_book import render_context
+from src.config import config
+
+FONTS_PATH = Path(__file__).resolve().parent.parent / "fonts"
+PARAGRAPH = '<p class="ql-align-left">Návštěvníci jsou povinni dodržovat <b>bezpečnostní pokyny</b> a <i>nosit ochranné pomůcky</i>.</p>'
+
+
+def _pdf_objects(pdf: bytes) -> bytes:
+    # Objects are packed into compressed object streams, the page and font dictionaries are searched in both
+    objects = [pdf]
+    for stream in re.findall(rb"stream\r?\n(.*?)\r?\nendstream", pdf, re.DOTALL):
+        try:
+            objects.append(zlib.decompress(stream))
+        except zlib.error:
+            continue
+    return b"\n".join(objects)
+
+
+def _page_count(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type\s*/Page(?![a-zA-Z])", _pdf_objects(pdf)))
+
+
+def _fonts(pdf: bytes) -> set[str]:
+    # Subset prefixes (ABCDEF+) differ between documents
+    names = re.findall(rb"/BaseFont\s*/(?:[A-Z]{6}\+)?([^\s/<>\[\]()]+)", _pdf_objects(pdf))
+    return {name.decode("latin-1") for name in names}
+
+
+def _render(monkeypatch, two_layer: bool, paragraphs: int) -> bytes:
+    monkeypatch.setattr(config, "RENDER_TWO_LAYER", two_layer)
+    data = build_warm_up_sample("cs")
+    return generate_form(data, "<h2>Bezpečnostní pokyny</h2>" + PARAGRAPH * paragraphs).getvalue()
+
+
+@pytest.fixture(autouse=True)
+def bundled_fonts(monkeypatch):
+    monkeypatch.setattr(config, "FONTS_PATH", str(FONTS_PATH))
+    monkeypatch.setattr(render_context, "_context", None)
+    body_layer_cache.clear()
+    yield
+    body_layer_cache.clear()
+
+
+@pytest.mark.parametrize("paragraphs", [1, 40, 120])
+def test_two_layer_pdf_matches_single_pass(monkeypatch, paragraphs):
+    single = _render(monkeypatch, two_layer=False, paragraphs=paragraphs)
+    two_layer = _render(monkeypatch, two_layer=True, paragraphs=paragraphs)
+
+    # The guest section starts on a new page in the two-layer mode, at most one page more
+    assert _page_count(single) >= 1
+    assert _page_count(single) <= _page_count(two_layer) <= _page_count(single) + 1
+    # Fonts of the cached form text layer are embedded as well
+    assert _fonts(single)
+    assert _fonts(two_layer) == _fonts(single)
+
+
+def test_cached_layer_renders_the_same_pdf(monkeypatch):
+    first = _render(monkeypatch, two_layer=True, paragraphs=40)
+    second = _render(monkeypatch, two_layer=True, paragraphs=40)
+
+    assert body_layer_cache.stats()["hits"] == 1
+    assert _page_count(second) == _page_count(first)
+    assert _fonts(second) == _fonts(first)